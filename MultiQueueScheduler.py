@@ -0,0 +1,158 @@
+import heapq
+from operator import attrgetter
+from typing import List, Optional
+
+from Processor import Processor
+from Process import Process
+from Scheduler import Scheduler
+from policies import create_policy
+
+
+class MultiQueueScheduler(Scheduler):
+    """Scheduler com uma fila de prontos por processador.
+
+    Cada chegada entra na fila de um processador, escolhido em rodízio, e
+    cada processador só despacha da própria fila. Balanceamento de carga:
+    com steal, um processador ocioso de fila vazia rouba metade da fila
+    mais longa; com push_interval, a cada tantos ticks os processos
+    excedentes das filas acima da média são empurrados para as que estão
+    abaixo. Nos dois casos migram os processos do fim da fila (os que a
+    política escolheria por último), não os próximos da vítima.
+    migration_cost modela a afinidade: um atraso, em ticks, no início da
+    execução de um processo que volta a executar em um processador
+    diferente do último (cache frio). O atraso ocupa o processador mas não
+    faz parte do trabalho do processo: se ele for preemptado antes de
+    cumpri-lo, a parte que falta é descartada.
+    """
+
+    def __init__(self, processors: list, scheduling_algorithm: str, quantum: int = 3, steal: bool = True,
+                 push_interval: Optional[int] = None, migration_cost: int = 0):
+        super().__init__(processors, scheduling_algorithm, quantum)
+        self.local = [create_policy(scheduling_algorithm, quantum) for _ in processors]  # Política/fila de cada processador
+        self.steal = steal
+        self.push_interval = push_interval
+        self.migration_cost = migration_cost
+        self.delays = [0] * len(processors)  # Atraso de migração cobrado no último despacho de cada processador
+        self.ready = 0  # Processos prontos em todas as filas
+        self.next_queue = 0  # Rodízio das chegadas
+        self.longest = []  # Heap de (-tamanho, ID) das filas; entradas desatualizadas são corrigidas no topo
+        self.touched = set()  # Preemptivas: processadores cuja fila recebeu processos desde o último escalonamento
+        self.steals = 0
+        self.pushes = 0
+        self.migrations = 0
+
+    def ready_count(self) -> int:
+        return self.ready
+
+    def ready_processes(self) -> list:
+        return sorted((process for policy in self.local for process in policy.queue), key=attrgetter('pid'))
+
+    def enqueue(self, processor_id: int, process: Process, current_time: int, hook: str = 'on_preempt'):
+        # hook: evento da política (on_arrival, on_preempt ou on_migrate)
+        policy = self.local[processor_id]
+        getattr(policy, hook)(process, current_time)
+        self.ready += 1
+        if self.steal:
+            if len(self.longest) > 4 * len(self.local):
+                self.longest = [(-len(p.queue), i) for i, p in enumerate(self.local) if p.has_ready()]
+                heapq.heapify(self.longest)
+            heapq.heappush(self.longest, (-len(policy.queue), processor_id))
+        if self.policy.preemptive:
+            self.touched.add(processor_id)
+
+    def dequeue(self, processor_id: int, current_time: int) -> Process:
+        self.ready -= 1
+        return self.local[processor_id].select_next(current_time)
+
+    def take_last(self, processor_id: int, count: int, current_time: int) -> List[Process]:
+        taken = self.local[processor_id].take_last(count, current_time)
+        self.ready -= len(taken)
+        return taken
+
+    def add_process(self, process: Process):
+        self.enqueue(self.next_queue, process, process.arrival_time, 'on_arrival')
+        self.next_queue = (self.next_queue + 1) % len(self.local)
+
+    def preempt(self, processor: Processor, current_time: int):
+        # O processo volta para a fila do processador em que executava, sem o atraso de migração não cumprido
+        process = processor.current_process
+        process.remaining_time -= max(0, self.delays[processor.id] - (current_time - process.start_time))
+        self.delays[processor.id] = 0
+        self.enqueue(processor.id, process, current_time)
+        processor.release_process(current_time)
+
+    def assign(self, processor: Processor, process: Process, current_time: int):
+        # O atraso de migração é executado antes do trabalho (o laço de ticks desconta remaining_time)
+        self.delays[processor.id] = 0
+        if process.last_processor is not None and process.last_processor != processor.id:
+            self.migrations += 1
+            self.delays[processor.id] = self.migration_cost
+            process.remaining_time += self.migration_cost
+        process.last_processor = processor.id
+        super().assign(processor, process, current_time)
+
+    def schedule(self, current_time: int):
+        if self.push_interval and current_time % self.push_interval == 0:
+            self.push_migration(current_time)
+        super().schedule(current_time)
+
+    def schedule_ready(self, current_time: int):
+        # Só os processadores ociosos são visitados; os que seguem sem trabalho voltam ao conjunto
+        waiting = []
+        while self.idle and self.ready:
+            processor_id = heapq.heappop(self.idle)
+            if self.local[processor_id].has_ready() or (self.steal and self.steal_for(processor_id, current_time)):
+                self.assign(self.processors[processor_id], self.dequeue(processor_id, current_time), current_time)
+            else:
+                waiting.append(processor_id)
+        for processor_id in waiting:
+            heapq.heappush(self.idle, processor_id)
+
+    def schedule_preemption(self, current_time: int):
+        # Cada processador compara o processo em execução apenas com a própria fila
+        for processor_id in sorted(self.touched):
+            processor = self.processors[processor_id]
+            policy = self.local[processor_id]
+            if processor.current_process is not None and policy.should_preempt(self.remaining(processor.current_process)):
+                self.preempt(processor, current_time)
+                self.assign(processor, self.dequeue(processor_id, current_time), current_time)
+        self.touched.clear()
+
+    def longest_queue(self) -> Optional[int]:
+        longest = self.longest
+        while longest:
+            size, processor_id = longest[0]
+            actual = len(self.local[processor_id].queue)
+            if -size == actual and actual > 0:
+                return processor_id
+            heapq.heappop(longest)
+            if actual > 0:
+                heapq.heappush(longest, (-actual, processor_id))
+        return None
+
+    def steal_for(self, thief: int, current_time: int) -> bool:
+        # Move para a fila do processador ocioso a metade final da fila mais longa
+        victim = self.longest_queue()
+        if victim is None:
+            return False
+        for process in self.take_last(victim, (len(self.local[victim].queue) + 1) // 2, current_time):
+            self.enqueue(thief, process, current_time, 'on_migrate')
+        self.steals += 1
+        return True
+
+    def push_migration(self, current_time: int):
+        # Empurra os excedentes das filas acima da média para as que estão abaixo
+        sizes = [len(policy.queue) for policy in self.local]
+        target = -(-self.ready // len(sizes))
+        receivers: List[int] = [i for i, size in enumerate(sizes) if size < target]
+        for donor, size in enumerate(sizes):
+            if size <= target or not receivers:
+                continue
+            room = sum(target - sizes[receiver] for receiver in receivers)
+            for process in self.take_last(donor, min(size - target, room), current_time):
+                receiver = receivers[-1]
+                self.enqueue(receiver, process, current_time, 'on_migrate')
+                self.pushes += 1
+                sizes[receiver] += 1
+                if sizes[receiver] >= target:
+                    receivers.pop()
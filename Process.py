@@ -1,6 +1,8 @@
 from typing import List, Optional
 
 class Process:
+    __slots__ = ('pid', 'arrival_time', 'duration', 'remaining_time', 'priority', 'start_time', 'first_start_time', 'finish_time', 'last_processor', 'level')
+
     def __init__(self, pid: int, arrival_time: float, duration: int, priority: int):
         self.pid = pid
         self.arrival_time = arrival_time
@@ -8,7 +10,10 @@ class Process:
         self.remaining_time = duration
         self.priority = priority  
         self.start_time = None
+        self.first_start_time = None  # Primeiro despacho (start_time guarda o último)
         self.finish_time = None
+        self.last_processor = None  # Último processador em que executou (afinidade)
+        self.level = 0  # Nível atual no MLFQ
 
     def is_finished(self) -> bool:
         return self.remaining_time <= 0
\ No newline at end of file
@@ -0,0 +1,147 @@
+import random
+from typing import List, Optional
+
+import numpy as np
+
+from Processor import Processor
+from policies import create_policy
+from profiling import RunProfile
+from Scheduler import Scheduler
+from Simulation import DEFAULT_DURATION_RANGE, Simulation
+
+INITIAL_CAPACITY = 1024
+
+
+class ProcessTable:
+    """Tabela de processos em estrutura de vetores, indexada pelo pid.
+
+    Cada campo de Process vira um vetor tipado do numpy; start_time e
+    finish_time usam NaN no lugar de None. A capacidade dobra quando cheia.
+    """
+
+    FIELDS = {
+        'arrival_time': np.float64,
+        'duration': np.int32,
+        'remaining_time': np.int32,
+        'priority': np.int32,
+        'start_time': np.float64,
+        'finish_time': np.float64,
+        'level': np.int32,  # Nível atual no MLFQ
+    }
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        self.size = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.full(capacity, np.nan) if dtype is np.float64 else np.zeros(capacity, dtype=dtype))
+
+    def add(self, arrival_time: float, duration: int, priority: int) -> int:
+        if self.size == self.capacity:
+            self.grow()
+        pid = self.size
+        self.arrival_time[pid] = arrival_time
+        self.duration[pid] = duration
+        self.remaining_time[pid] = duration
+        self.priority[pid] = priority
+        self.size += 1
+        return pid
+
+    def grow(self) -> None:
+        new_capacity = self.capacity * 2
+        for name, dtype in self.FIELDS.items():
+            old = getattr(self, name)
+            new = np.full(new_capacity, np.nan) if dtype is np.float64 else np.zeros(new_capacity, dtype=dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def is_finished(self, pid: int) -> bool:
+        return self.remaining_time[pid] <= 0
+
+    def memory_usage(self) -> int:
+        # Bytes alocados pelos vetores da tabela
+        return sum(getattr(self, name).nbytes for name in self.FIELDS)
+
+    def bytes_per_process(self) -> float:
+        return self.memory_usage() / max(self.size, 1)
+
+
+class TableProcessor(Processor):
+    """Processador cujo processo atual é um pid da ProcessTable."""
+
+    __slots__ = ('table',)
+
+    def __init__(self, id: int, table: ProcessTable) -> None:
+        super().__init__(id)
+        self.table = table
+
+    def assign_process(self, pid: int, current_time: float) -> None:
+        self.update_idle_time(current_time)
+        self.current_process = pid
+        self.table.start_time[pid] = current_time
+
+    def release_process(self, current_time: float) -> None:
+        if self.current_process is not None:
+            self.table.finish_time[self.current_process] = current_time
+            self.current_process = None
+        self.last_idle_time_update = current_time
+
+
+class TableScheduler(Scheduler):
+    """Scheduler que opera sobre pids da ProcessTable, sem objetos Process."""
+
+    def __init__(self, processors: list, scheduling_algorithm: str, table: ProcessTable, quantum: int = 3):
+        super().__init__(processors, scheduling_algorithm, quantum)
+        self.table = table
+        self.policy = create_policy(scheduling_algorithm, quantum, table)
+        self.queue = self.policy.queue
+
+    def add_process(self, pid: int):
+        self.policy.on_arrival(pid, self.table.arrival_time[pid])
+
+    def remaining(self, pid: int) -> int:
+        return self.table.remaining_time[pid]
+
+    def ready_processes(self) -> list:
+        return sorted(self.queue)
+
+
+class TableSimulation(Simulation):
+    """Simulation com os processos guardados em uma ProcessTable.
+
+    Não cria objetos Process: a fila, os processadores e o laço de ticks
+    trabalham apenas com pids. Para a mesma semente, os resultados são os
+    mesmos de Simulation.simulate. Apenas o laço de ticks (simulate) é
+    suportado.
+    """
+
+    def __init__(self, num_processors: int, scheduling_algorithm: str, arrival_rate: float, quantum: int,
+                 capacity: int = INITIAL_CAPACITY, duration_range: tuple = DEFAULT_DURATION_RANGE,
+                 profile: Optional[RunProfile] = None, workload=None) -> None:
+        self.table = ProcessTable(capacity)  # Antes do super: processadores e escalonador usam a tabela
+        super().__init__(num_processors, scheduling_algorithm, arrival_rate, quantum,
+                         duration_range=duration_range, profile=profile, workload=workload)
+
+    def build_processors(self, num_processors: int) -> List[TableProcessor]:
+        return [TableProcessor(i, self.table) for i in range(num_processors)]
+
+    def build_scheduler(self, scheduling_algorithm: str, quantum: int) -> Scheduler:
+        return TableScheduler(self.processors, scheduling_algorithm, self.table, quantum)
+
+    def create_process(self, pid: int):
+        if self.workload is not None:
+            duration, priority = self.workload.next_job()
+        else:
+            duration = random.randint(*self.duration_range)
+            priority = random.randint(1, 5)
+        self.scheduler.add_process(self.table.add(self.current_time, duration, priority))
+
+    def update_processors(self, current_time: int) -> None:
+        remaining_time = self.table.remaining_time
+        for processor in self.processors:
+            processor.update_idle_time(current_time)
+            pid = processor.current_process
+            if pid is not None:
+                remaining_time[pid] -= 1
+                if remaining_time[pid] <= 0:
+                    self.scheduler.release(processor, current_time)
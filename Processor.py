@@ -1,14 +1,17 @@
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from Process import Process
 
 
 class Processor:
+    __slots__ = ('id', 'current_process', 'idle_time', 'last_idle_time_update', 'on_complete')
+
     def __init__(self, id: int) -> None:
         self.id: int = id  # ID do processador
         self.current_process: Optional[Process] = None  # Processo atualmente sendo executado
         self.idle_time: float = 0  # Tempo ocioso do processador
         self.last_idle_time_update: float = 0  # Última atualização de tempo ocioso
+        self.on_complete: Optional[Callable[[Process], None]] = None  # Chamado quando um processo termina
 
     def is_idle(self, current_time: float) -> bool:
         return self.current_process is None
@@ -22,9 +25,13 @@ class Processor:
         self.update_idle_time(current_time)
         self.current_process = process
         process.start_time = current_time
+        if process.first_start_time is None:
+            process.first_start_time = current_time
 
     def release_process(self, current_time: float) -> None:
         if self.current_process:
             self.current_process.finish_time = current_time
+            if self.on_complete and self.current_process.is_finished():
+                self.on_complete(self.current_process)
             self.current_process = None
         self.last_idle_time_update = current_time
@@ -0,0 +1,136 @@
+import heapq
+from collections import deque
+from itertools import count
+from typing import Callable, Optional
+
+from Process import Process
+
+
+class FifoQueue:
+    """Fila de prontos em ordem de chegada (FIFO e Round Robin)."""
+
+    def __init__(self) -> None:
+        self.items = deque()
+
+    def push(self, process: Process) -> None:
+        self.items.append(process)
+
+    def pop(self) -> Process:
+        return self.items.popleft()
+
+    def peek(self) -> Process:
+        return self.items[0]
+
+    def pop_last(self, count: int) -> list:
+        # Os `count` últimos da fila (os mais recentes), na ordem da fila
+        taken = [self.items.pop() for _ in range(min(count, len(self.items)))]
+        taken.reverse()
+        return taken
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class HeapQueue:
+    """Fila de prontos em heap binário, ordenada por uma chave do processo.
+
+    Empates são desfeitos pela ordem de inserção (FIFO), o que reproduz a
+    ordenação estável usada antes pelo Scheduler. push e pop são O(log n).
+    A chave é lida no momento da inserção.
+    """
+
+    def __init__(self, key: Callable[[Process], float]) -> None:
+        self.key = key
+        self.items = []
+        self.counter = count()  # Desempate estável
+
+    def push(self, process: Process) -> None:
+        heapq.heappush(self.items, (self.key(process), next(self.counter), process))
+
+    def pop(self) -> Process:
+        return heapq.heappop(self.items)[2]
+
+    def peek(self) -> Process:
+        return self.items[0][2]
+
+    def peek_key(self) -> float:
+        # Chave do próximo processo, como lida na inserção
+        return self.items[0][0]
+
+    def pop_last(self, count: int) -> list:
+        # Os `count` que sairiam por último, na ordem de retirada (uma lista ordenada também é um heap)
+        ordered = sorted(self.items)
+        split = len(ordered) - min(count, len(ordered))
+        self.items = ordered[:split]
+        return [item[2] for item in ordered[split:]]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        # Em ordem de heap, não de retirada
+        return (item[2] for item in self.items)
+
+    def __getstate__(self) -> dict:
+        # itertools.count não é serializável em todas as versões: guarda o próximo valor
+        state = self.__dict__.copy()
+        state['counter'] = next(self.counter)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.counter = count(state['counter'])
+
+
+class BucketQueue:
+    """Fila de prontos com um deque FIFO por nível (0 = mais prioritário).
+
+    Cada item guarda o instante de inserção, e o nível efetivo da cabeça de
+    cada deque é calculado na retirada por effective(nível, inserção, agora).
+    Assim o envelhecimento é aplicado sem percorrer a fila: push é O(1) e
+    pop examina só as cabeças (O(níveis)), pois a cabeça é o item mais
+    antigo do seu nível. Empates vão para a inserção mais antiga.
+    """
+
+    def __init__(self, levels: int, effective: Callable[[int, float, float], int]) -> None:
+        self.buckets = [deque() for _ in range(levels)]
+        self.effective = effective
+        self.size = 0
+
+    def push(self, process: Process, level: int, now: float) -> None:
+        self.buckets[level].append((now, process))
+        self.size += 1
+
+    def pop(self, now: float) -> tuple:
+        # Retorna (processo, nível efetivo) do melhor item
+        best = None
+        best_key = None
+        for level, bucket in enumerate(self.buckets):
+            if bucket:
+                enqueued = bucket[0][0]
+                key = (self.effective(level, enqueued, now), enqueued)
+                if best is None or key < best_key:
+                    best, best_key = level, key
+        self.size -= 1
+        return self.buckets[best].popleft()[1], best_key[0]
+
+    def pop_last(self, count: int, now: float) -> list:
+        # (processo, nível efetivo) dos `count` itens mais recentes dos níveis mais altos, do melhor ao pior
+        taken = []
+        for level in range(len(self.buckets) - 1, -1, -1):
+            bucket = self.buckets[level]
+            while bucket and len(taken) < count:
+                enqueued, process = bucket.pop()
+                taken.append((process, self.effective(level, enqueued, now)))
+        self.size -= len(taken)
+        taken.reverse()
+        return taken
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        return (process for bucket in self.buckets for _, process in bucket)
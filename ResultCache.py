@@ -0,0 +1,132 @@
+import ast
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # Limite padrão do cache em disco
+IMPLEMENTATION_ROOT = 'replications'  # Ponto de entrada das replicações de main.py e sweep.py
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=None)
+def local_dependencies(root: str) -> Tuple[str, ...]:
+    """O módulo `root` e todos os módulos deste diretório que ele importa, direta ou indiretamente.
+
+    Lido dos comandos import do código-fonte (inclusive os de dentro de
+    funções), sem importar nada, então a lista acompanha o código sozinha.
+    """
+    found = set()
+    pending = [root]
+    while pending:
+        module = pending.pop()
+        path = os.path.join(BASE_DIR, module + '.py')
+        if module in found or not os.path.exists(path):
+            continue
+        found.add(module)
+        with open(path, 'rb') as file:
+            tree = ast.parse(file.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split('.')[0])
+    return tuple(sorted(found))
+
+
+def implementation_version(modules: Optional[Iterable[str]] = None) -> str:
+    """Hash do código-fonte dos módulos que definem o resultado da simulação.
+
+    Por padrão, todos os módulos locais alcançados a partir de
+    IMPLEMENTATION_ROOT. Qualquer mudança nesses arquivos invalida
+    automaticamente as entradas antigas do cache.
+    """
+    digest = hashlib.sha256()
+    base = BASE_DIR
+    for module in local_dependencies(IMPLEMENTATION_ROOT) if modules is None else modules:
+        with open(os.path.join(base, module + '.py'), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """Cache em disco (SQLite) de resultados de replicações, com despejo LRU.
+
+    A chave combina a configuração, a versão da implementação, a semente e o
+    índice da replicação. Quando o tamanho total passa de max_bytes, as
+    entradas usadas há mais tempo são removidas.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS results '
+            '(key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used INTEGER NOT NULL)'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+        self.clock = self.connection.execute('SELECT COALESCE(MAX(last_used), 0) FROM results').fetchone()[0]
+        self.pending = 0
+
+    @staticmethod
+    def key(config: dict, version: str, seed: int, index: int) -> str:
+        payload = json.dumps([config, version, seed, index], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def tick(self) -> int:
+        self.clock += 1
+        return self.clock
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        for start in range(0, len(keys), 500):  # Limite de parâmetros do SQLite
+            batch = keys[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.connection.execute(f'SELECT key, value FROM results WHERE key IN ({placeholders})', batch)
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            self.connection.executemany('UPDATE results SET last_used = ? WHERE key = ?',
+                                        [(self.tick(), key) for key in found])
+            self.connection.commit()
+        return found
+
+    def put(self, key: str, value: Any) -> None:
+        # Grava sem confirmar; flush() confirma a transação e aplica o limite de tamanho
+        encoded = json.dumps(value)
+        self.connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                (key, encoded, len(key) + len(encoded), self.tick()))
+        self.pending += 1
+
+    def flush(self) -> None:
+        if self.pending:
+            self.evict()
+            self.connection.commit()
+            self.pending = 0
+
+    def evict(self) -> None:
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        removed = []
+        for key, size in self.connection.execute('SELECT key, size FROM results ORDER BY last_used'):
+            removed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.connection.executemany('DELETE FROM results WHERE key = ?', removed)
+
+    def size(self) -> int:
+        return self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
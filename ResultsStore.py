@@ -0,0 +1,139 @@
+import os
+import shutil
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+CHUNK_ROWS = 65536  # Linhas acumuladas pelo writer antes de gravar um bloco
+CHUNK_PREFIX = 'chunk-'  # Pasta de um bloco dentro da partição
+
+
+class ResultsStore:
+    """Armazena resultados de replicações em formato colunar binário.
+
+    Cada partição (por exemplo algorithm=FCFS/num_processors=4/arrival_rate=1)
+    é um diretório com uma pasta por bloco (chunk-000000, ...); cada append
+    grava nela um .npy por coluna. O bloco é escrito num diretório temporário
+    e renomeado de uma vez, então todas as colunas têm sempre os mesmos
+    blocos. As leituras usam memória mapeada, então a análise carrega só as
+    colunas de que precisa. Partições no formato antigo (uma pasta por
+    coluna) continuam legíveis.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def partition_path(self, **keys) -> str:
+        return os.path.join(self.root, *(f"{name}={value}" for name, value in keys.items()))
+
+    def append(self, columns: Dict[str, np.ndarray], **keys) -> None:
+        # Grava um novo bloco com todas as colunas (mesmo número de linhas)
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+        if len({len(values) for values in columns.values()}) > 1:
+            raise ValueError("Todas as colunas de um bloco devem ter o mesmo tamanho")
+        path = self.partition_path(**keys)
+        os.makedirs(path, exist_ok=True)
+        chunk = f"{CHUNK_PREFIX}{self.next_chunk(path):06d}"
+        tmp = os.path.join(path, '.' + chunk + '.tmp')
+        shutil.rmtree(tmp, ignore_errors=True)  # Resto de um append interrompido
+        os.makedirs(tmp)
+        for name, values in columns.items():
+            with open(os.path.join(tmp, name + '.npy'), 'wb') as file:
+                np.save(file, values)
+        os.rename(tmp, os.path.join(path, chunk))  # Todas as colunas do bloco aparecem juntas
+
+    def chunk_dirs(self, path: str) -> List[str]:
+        if not os.path.isdir(path):
+            return []
+        return sorted(name for name in os.listdir(path) if name.startswith(CHUNK_PREFIX))
+
+    def next_chunk(self, path: str) -> int:
+        chunks = [-1] + [int(name[len(CHUNK_PREFIX):]) for name in self.chunk_dirs(path)]
+        for column_dir in self.legacy_columns(path):
+            chunks += [int(f[:-4]) for f in os.listdir(os.path.join(path, column_dir)) if f.endswith('.npy')]
+        return max(chunks) + 1
+
+    def legacy_columns(self, path: str) -> List[str]:
+        # Pastas de coluna do formato antigo (um .npy por bloco dentro de cada coluna)
+        if not os.path.isdir(path):
+            return []
+        return sorted(name for name in os.listdir(path) if '=' not in name and not name.startswith((CHUNK_PREFIX, '.'))
+                      and os.path.isdir(os.path.join(path, name)))
+
+    def writer(self, chunk_rows: int = CHUNK_ROWS, **keys) -> 'ResultsWriter':
+        return ResultsWriter(self, keys, chunk_rows)
+
+    def chunk_files(self, column: str, **keys) -> List[str]:
+        # Arquivos .npy da coluna, em ordem de bloco
+        path = self.partition_path(**keys)
+        files = []
+        legacy = os.path.join(path, column)
+        if os.path.isdir(legacy):
+            files += [os.path.join(legacy, f) for f in sorted(os.listdir(legacy)) if f.endswith('.npy')]
+        for chunk in self.chunk_dirs(path):
+            file = os.path.join(path, chunk, column + '.npy')
+            if os.path.exists(file):
+                files.append(file)
+        return files
+
+    def column_chunks(self, column: str, **keys) -> Iterator[np.ndarray]:
+        # Blocos da coluna, em ordem, como arrays mapeados em memória (forma preferida de ler)
+        for file in self.chunk_files(column, **keys):
+            yield np.load(file, mmap_mode='r')
+
+    def read_column(self, column: str, **keys) -> np.ndarray:
+        """Coluna inteira em um único array.
+
+        Copia todos os blocos para a memória; para colunas grandes, percorra
+        column_chunks em vez disso.
+        """
+        chunks = list(self.column_chunks(column, **keys))
+        if not chunks:
+            return np.empty(0)
+        return np.concatenate(chunks)
+
+    def columns(self, **keys) -> List[str]:
+        path = self.partition_path(**keys)
+        names = set(self.legacy_columns(path))
+        for chunk in self.chunk_dirs(path):
+            names.update(f[:-4] for f in os.listdir(os.path.join(path, chunk)) if f.endswith('.npy'))
+        return sorted(names)
+
+    def partitions(self) -> List[Dict[str, str]]:
+        # Lista as chaves de todas as partições que têm colunas gravadas
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            parts = os.path.relpath(dirpath, self.root).split(os.sep)
+            if parts != ['.'] and all('=' in part for part in parts) and any('=' not in d for d in dirnames):
+                found.append(dict(part.split('=', 1) for part in parts))
+        return sorted(found, key=lambda keys: sorted(keys.items()))
+
+
+class ResultsWriter:
+    """Acumula linhas em memória e grava blocos de `chunk_rows` na partição."""
+
+    def __init__(self, store: ResultsStore, keys: dict, chunk_rows: int = CHUNK_ROWS) -> None:
+        self.store = store
+        self.keys = keys
+        self.chunk_rows = chunk_rows
+        self.buffer: Dict[str, list] = {}
+        self.rows = 0
+
+    def add_row(self, **values) -> None:
+        for name, value in values.items():
+            self.buffer.setdefault(name, []).append(value)
+        self.rows += 1
+        if self.rows >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.rows:
+            self.store.append({name: np.array(values) for name, values in self.buffer.items()}, **self.keys)
+        self.buffer = {}
+        self.rows = 0
+
+    def __enter__(self) -> 'ResultsWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
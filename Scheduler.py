@@ -1,61 +1,123 @@
 from typing import List, Optional
 import heapq
-from collections import deque
+from operator import attrgetter
 
 from Processor import Processor
 from Process import Process
+from policies import create_policy
 
 
 class Scheduler:
     def __init__(self, processors: list, scheduling_algorithm: str, quantum: int = 3):
-        self.processors : list[Processor] = processors  # Lista de processadores
+        self.processors : list[Processor] = processors  # Lista de processadores (índice = ID)
         self.scheduling_algorithm = scheduling_algorithm  # Algoritmo de escalonamento
-        self.queue = deque()  # Fila de processos para RR e FIFO
         self.quantum = quantum  # Quantum para o Round Robin
+        self.policy = create_policy(scheduling_algorithm, quantum)  # Política registrada com esse nome
+        self.queue = self.policy.queue  # Fila de prontos da política (deque ou heap)
+        self.idle = [processor.id for processor in processors]  # Heap dos IDs dos processadores ociosos
+        self.assignments = [0] * len(processors)  # Atribuições por processador: invalida entradas antigas dos heaps
+        self.slices = []  # RR: heap de (tick de fim do quantum, ID do processador, atribuição)
+        self.running = []  # SRTF: heap de (-tick de término previsto, ID do processador, atribuição)
 
     def add_process(self, process: Process):
-        self.queue.append(process)
+        self.policy.on_arrival(process, process.arrival_time)
+
+    def remaining(self, process) -> int:
+        return process.remaining_time
+
+    def ready_count(self) -> int:
+        return len(self.queue)
+
+    def ready_processes(self) -> list:
+        # Processos prontos em ordem de pid (troca de política)
+        return sorted(self.queue, key=attrgetter('pid'))
+
+    def adopt(self, current_time: int):
+        # Assume processadores já em uso (troca de política): refaz o heap de
+        # ociosos e inicia os temporizadores dos processos em execução
+        self.idle = [processor.id for processor in self.processors if processor.current_process is None]
+        for processor in self.processors:
+            if processor.current_process is not None:
+                self.track(processor, processor.current_process, current_time)
 
     def schedule(self, current_time: int):
-        if self.scheduling_algorithm == 'fifo':
-            self.schedule_fifo(current_time)
-        elif self.scheduling_algorithm == 'sjf':
-            self.schedule_sjf(current_time)
-        elif self.scheduling_algorithm == 'round_robin':
+        if self.policy.time_sliced:
             self.schedule_round_robin(current_time)
-        elif self.scheduling_algorithm == 'priority':
-            self.schedule_priority(current_time)
-            
-    def schedule_fifo(self, current_time: int):
-        for processor in self.processors:
-            if processor.is_idle(current_time) and self.queue:
-                process = self.queue.popleft()
-                processor.assign_process(process, current_time)
-
-    def schedule_sjf(self, current_time: int):
-        # Shortest Job First (SJF) - escolhe o processo com menor duração restante
-        if self.queue:
-            self.queue = deque(sorted(self.queue, key=lambda p: p.remaining_time))
-        for processor in self.processors:
-            if processor.is_idle(current_time) and self.queue:
-                process = self.queue.popleft()
-                processor.assign_process(process, current_time)
+        else:
+            self.schedule_ready(current_time)
+            if self.policy.preemptive:
+                self.schedule_preemption(current_time)
+
+    def assign(self, processor: Processor, process, current_time: int):
+        processor.assign_process(process, current_time)
+        self.track(processor, process, current_time)
+
+    def track(self, processor: Processor, process, current_time: int):
+        # Registra o temporizador que a política precisar para o processo em execução
+        self.assignments[processor.id] += 1
+        if self.policy.time_sliced:
+            time_slice = self.policy.time_slice(process)
+            if self.remaining(process) > time_slice:
+                heapq.heappush(self.slices, (current_time + time_slice, processor.id, self.assignments[processor.id]))
+        elif self.policy.preemptive:
+            if len(self.running) > 4 * len(self.processors):
+                self.compact_running()
+            finish = current_time + self.remaining(process)
+            heapq.heappush(self.running, (-finish, processor.id, self.assignments[processor.id]))
+
+    def is_current(self, processor_id: int, assignment: int) -> bool:
+        # A entrada do heap ainda se refere ao processo em execução no processador?
+        return self.assignments[processor_id] == assignment and self.processors[processor_id].current_process is not None
+
+    def compact_running(self):
+        # Remove as entradas de processos que já terminaram ou foram preemptados
+        self.running = [entry for entry in self.running if self.is_current(entry[1], entry[2])]
+        heapq.heapify(self.running)
+
+    def release(self, processor: Processor, current_time: int):
+        # Libera o processador e o devolve ao conjunto de ociosos
+        processor.release_process(current_time)
+        heapq.heappush(self.idle, processor.id)
+
+    def preempt(self, processor: Processor, current_time: int):
+        # Devolve o processo em execução à fila de prontos
+        self.policy.on_preempt(processor.current_process, current_time)
+        processor.release_process(current_time)
+
+    def schedule_ready(self, current_time: int):
+        # Atribui aos processadores ociosos, em ordem de ID, os próximos processos da política
+        while self.idle and self.policy.has_ready():
+            processor = self.processors[heapq.heappop(self.idle)]
+            self.assign(processor, self.policy.select_next(current_time), current_time)
+
+    # FIFO, SJF e prioridade diferem apenas na ordem da fila da política
+    schedule_fifo = schedule_ready
+    schedule_sjf = schedule_ready
+    schedule_priority = schedule_ready
 
     def schedule_round_robin(self, current_time: int):
-        for processor in self.processors:
-            if processor.is_idle(current_time) and self.queue:
-                process = self.queue.popleft()
-                processor.assign_process(process, current_time)
-            elif processor.current_process:
-                processor.current_process.remaining_time -= self.quantum
-                if processor.current_process.remaining_time > 0:
-                    self.queue.append(processor.current_process)  # Preempção e volta à fila
-                processor.release_process(current_time)
-
-    def schedule_priority(self, current_time: int):
-        if self.queue:
-            self.queue = deque(sorted(self.queue, key=lambda p: p.priority))
-        for processor in self.processors:
-            if processor.is_idle(current_time) and self.queue:
-                process = self.queue.popleft()
-                processor.assign_process(process, current_time)
\ No newline at end of file
+        # Processos que executaram um quantum inteiro voltam ao fim da fila; em seguida
+        # os processadores ociosos (inclusive os recém-liberados) recebem os próximos
+        slices = self.slices
+        while slices and slices[0][0] <= current_time:
+            _, processor_id, assignment = heapq.heappop(slices)
+            if self.is_current(processor_id, assignment):
+                processor = self.processors[processor_id]
+                self.preempt(processor, current_time)
+                heapq.heappush(self.idle, processor_id)
+        self.schedule_ready(current_time)
+
+    def schedule_preemption(self, current_time: int):
+        # SRTF: enquanto o melhor processo pronto tiver tempo restante menor que o do
+        # processo em execução que termina por último (topo do heap), troca os dois
+        while self.running and self.policy.has_ready():
+            _, processor_id, assignment = self.running[0]
+            if not self.is_current(processor_id, assignment):
+                heapq.heappop(self.running)
+                continue
+            processor = self.processors[processor_id]
+            if not self.policy.should_preempt(self.remaining(processor.current_process)):
+                break
+            heapq.heappop(self.running)
+            self.preempt(processor, current_time)
+            self.assign(processor, self.policy.select_next(current_time), current_time)
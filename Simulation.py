@@ -1,33 +1,108 @@
+import math
 import random
 import heapq
+import time
+from bisect import insort
 import numpy as np
 from typing import List, Optional
 
 from Processor import Processor
 from Process import Process
 from Scheduler import Scheduler
+from MultiQueueScheduler import MultiQueueScheduler
+from profiling import RunProfile
+from streaming import CompletionSink
+
+ARRIVAL_BLOCK = 4096  # Ticks sorteados por bloco no motor orientado a eventos
+DEFAULT_DURATION_RANGE = (1, 10)  # Duração uniforme inteira dos processos (inclusivo)
 
 class Simulation:
-    def __init__(self, num_processors: int, scheduling_algorithm: str, arrival_rate: float, quantum: int) -> None:
+    def __init__(self, num_processors: int, scheduling_algorithm: str, arrival_rate: float, quantum: int,
+                 sink: Optional[CompletionSink] = None, duration_range: tuple = DEFAULT_DURATION_RANGE,
+                 profile: Optional[RunProfile] = None, workload=None, run_queues: Optional[dict] = None) -> None:
         self.current_time: float = 0
+        self.next_pid: int = 0  # pid do próximo processo criado
         self.processes: List[Process] = []
-        self.processors: List[Processor] = [Processor(i) for i in range(num_processors)]
-        self.scheduler: Scheduler = Scheduler(self.processors, scheduling_algorithm, quantum)
+        self.processors: List[Processor] = self.build_processors(num_processors)
+        self.run_queues: Optional[dict] = run_queues
+        self.scheduler: Scheduler = self.build_scheduler(scheduling_algorithm, quantum)
         self.arrival_rate: float = arrival_rate  # Taxa de chegada dos processos
+        self.duration_range: tuple = tuple(duration_range)  # Faixa das durações sorteadas
+        self.sink: Optional[CompletionSink] = sink  # Com sink, processos concluídos não são guardados
+        self.profile: Optional[RunProfile] = profile  # Com profile, simulate() mede fases e contadores
+        self.workload = workload  # TickWorkload opcional: sorteios em blocos no lugar de random/np.random
+        if sink is not None:
+            for processor in self.processors:
+                processor.on_complete = self.complete_process
+
+    def build_processors(self, num_processors: int) -> List[Processor]:
+        return [Processor(i) for i in range(num_processors)]
+
+    def build_scheduler(self, scheduling_algorithm: str, quantum: int) -> Scheduler:
+        if self.run_queues is None:
+            return Scheduler(self.processors, scheduling_algorithm, quantum)
+        # Uma fila por processador; run_queues traz as opções de MultiQueueScheduler (steal, push_interval...)
+        return MultiQueueScheduler(self.processors, scheduling_algorithm, quantum, **self.run_queues)
+
+    def change_policy(self, scheduling_algorithm: str) -> None:
+        """Troca a política de escalonamento no meio da execução (fork de checkpoint).
+
+        Os processos prontos entram na nova política como chegadas, em ordem
+        de pid (ready_processes); os que estão em execução continuam nos processadores, com os
+        temporizadores da nova política contados a partir do instante atual.
+        """
+        if scheduling_algorithm == self.scheduler.scheduling_algorithm:
+            return
+        ready = self.scheduler.ready_processes()
+        self.scheduler = self.build_scheduler(scheduling_algorithm, self.scheduler.quantum)
+        for process in ready:
+            self.scheduler.add_process(process)
+        self.scheduler.adopt(self.current_time)
+
+    def reset_statistics(self) -> None:
+        # Fim do aquecimento: descarta o tempo ocioso e os processos concluídos até aqui
+        for processor in self.processors:
+            processor.idle_time = 0
+        self.processes = [process for process in self.processes if not process.is_finished()]
+        if self.sink is not None:
+            self.sink.reset()
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self.workload is not None:
+            # Os fluxos do workload não são serializados: recomeçam depois dos valores já consumidos
+            self.workload.open_streams({'arrivals': int(self.current_time), 'duration': self.next_pid,
+                                        'priority': self.next_pid})
 
     def create_process(self, pid: int):
-        arrival_time = self.current_time
-        duration = random.randint(1, 10) 
-        priority = random.randint(1, 5) 
-        process = Process(pid, arrival_time, duration, priority)
-        self.processes.append(process)
+        if self.workload is not None:
+            duration, priority = self.workload.next_job()
+        else:
+            duration = random.randint(*self.duration_range)
+            priority = random.randint(1, 5) 
+        self.add_process(pid, duration, priority)
+
+    def add_process(self, pid: int, duration: int, priority: int) -> None:
+        # Cria o processo no instante atual e o entrega ao escalonador
+        process = Process(pid, self.current_time, duration, priority)
+        if self.sink is None:
+            self.processes.append(process)
         self.scheduler.add_process(process)
 
+    def complete_process(self, process: Process) -> None:
+        # O tick de término também é de execução, daí o +1 no turnaround
+        turnaround = process.finish_time - process.arrival_time + 1
+        self.sink.add(turnaround - process.duration, turnaround, process.first_start_time - process.arrival_time)
+
     def simulate(self, total_time: int) -> None:
-        process_id = 0
+        # Avança de current_time até total_time; chamadas sucessivas continuam a mesma execução
+        if self.profile is not None:
+            return self.simulate_profiled(total_time)
+        next_arrivals = self.arrival_counts(math.ceil(total_time) - int(self.current_time)).__next__
+        process_id = self.next_pid
         while self.current_time < total_time:
             # Gerar novos processos baseados na distribuição de Poisson
-            n = np.random.binomial(n=10, p=self.arrival_rate)
+            n = next_arrivals()
             if n > 0:
                 for i in range(n):
                     self.create_process(process_id)
@@ -37,15 +112,211 @@ class Simulation:
             self.scheduler.schedule(self.current_time)
 
             # Atualização do tempo dos processadores e processos
-            for processor in self.processors:
-                processor.update_idle_time(self.current_time)
-                if processor.current_process:
-                    processor.current_process.remaining_time -= 1
-                    if processor.current_process.is_finished():
-                        processor.release_process(self.current_time)
+            self.update_processors(self.current_time)
             
             self.current_time += 1
+        self.next_pid = process_id
+
+    def simulate_profiled(self, total_time: int) -> None:
+        # Mesmo laço de simulate(), com timers por fase e contadores no RunProfile
+        profile = self.profile
+        phases = profile.phases
+        clock = time.perf_counter
+        next_arrivals = self.arrival_counts(math.ceil(total_time) - int(self.current_time)).__next__
+        profile.start()
+        process_id = self.next_pid
+        while self.current_time < total_time:
+            start = clock()
+            n = next_arrivals()
+            for i in range(n):
+                self.create_process(process_id)
+                process_id += 1
+            arrived = clock()
+            profile.observe_ready(self.scheduler.ready_count())
+            scheduling = clock()
+            self.scheduler.schedule(self.current_time)
+            scheduled = clock()
+            busy = sum(processor.current_process is not None for processor in self.processors)
+            updating = clock()
+            self.update_processors(self.current_time)
+            updated = clock()
+            finished = busy - sum(processor.current_process is not None for processor in self.processors)
+
+            phases['arrivals'] += arrived - start
+            phases['schedule'] += scheduled - scheduling
+            phases['update'] += updated - updating
+            profile.decision_time += scheduled - scheduling
+            profile.decisions += 1
+            profile.events += n + finished
+            self.current_time += 1
+        self.next_pid = process_id
+        profile.stop()
+
+    def update_processors(self, current_time: int) -> None:
+        for processor in self.processors:
+            processor.update_idle_time(current_time)
+            if processor.current_process:
+                processor.current_process.remaining_time -= 1
+                if processor.current_process.is_finished():
+                    self.scheduler.release(processor, current_time)
 
     def get_average_idle_time(self) -> float:
         total_idle_time = sum(processor.idle_time for processor in self.processors)
         return total_idle_time / len(self.processors)
+
+    def arrival_counts(self, total_ticks: int):
+        # Chegadas de cada tick, sorteadas em blocos (mesmo fluxo das chamadas tick a tick)
+        start = 0
+        while start < total_ticks:
+            size = min(ARRIVAL_BLOCK, total_ticks - start)
+            yield from self.draw_arrivals(size).tolist()
+            start += size
+
+    def arrival_ticks(self, total_ticks: int):
+        """Gera (tick, n) apenas para os ticks com chegadas.
+
+        A binomial é sorteada em blocos, consumindo o gerador global do numpy
+        exatamente como as chamadas tick a tick de simulate().
+        """
+        start = 0
+        while start < total_ticks:
+            size = min(ARRIVAL_BLOCK, total_ticks - start)
+            counts = self.draw_arrivals(size)
+            for offset in np.flatnonzero(counts):
+                yield start + int(offset), int(counts[offset])
+            start += size
+
+    def draw_arrivals(self, size: int) -> np.ndarray:
+        # Número de chegadas em cada um dos próximos `size` ticks
+        if self.workload is not None:
+            return self.workload.take_arrivals(size)
+        return np.random.binomial(n=10, p=self.arrival_rate, size=size)
+
+    def simulate_events(self, total_time: int) -> None:
+        """Motor orientado a eventos equivalente a simulate().
+
+        Em vez de avançar um tick por vez, salta direto para o próximo tick em
+        que algo muda (chegada, término ou expiração de quantum). Para a mesma
+        semente produz os mesmos tempos ociosos e os mesmos processos. Usa
+        apenas a fila global (sem run_queues).
+        """
+        if isinstance(self.scheduler, MultiQueueScheduler):
+            raise ValueError("O motor orientado a eventos não suporta filas por processador; use simulate()")
+        if self.current_time != 0:
+            raise ValueError("O motor orientado a eventos sempre começa do tick 0; use simulate() para continuar uma execução")
+        total_ticks = math.ceil(total_time)
+        policy = self.scheduler.policy
+        idle = list(range(len(self.processors)))  # IDs dos processadores ociosos, em ordem
+        completions = []  # Heap de (tick de término, ID do processador, despacho)
+        slices = []  # RR: heap de (tick de fim do quantum, ID do processador, despacho)
+        running = []  # SRTF: heap de (-tick de término previsto, ID do processador, despacho)
+        finish_ticks = [0] * len(self.processors)  # Tick em que o processo atual terminaria
+        slice_lengths = [0] * len(self.processors)  # Quantum da execução atual (políticas time_sliced)
+        dispatches = [0] * len(self.processors)  # Despachos por processador: invalida entradas antigas
+
+        arrivals = self.arrival_ticks(total_ticks)
+        next_arrival = next(arrivals, None)
+        process_id = 0
+        tick = 0
+        while tick < total_ticks:
+            self.current_time = tick
+
+            # Chegadas
+            arrived = next_arrival is not None and next_arrival[0] == tick
+            if arrived:
+                for i in range(next_arrival[1]):
+                    self.create_process(process_id)
+                    process_id += 1
+                next_arrival = next(arrivals, None)
+
+            # Escalonamento: fim de quantum, despacho e preempção
+            while slices and slices[0][0] == tick:
+                _, processor_id, dispatch = heapq.heappop(slices)
+                processor = self.processors[processor_id]
+                processor.current_process.remaining_time -= slice_lengths[processor_id]
+                policy.on_preempt(processor.current_process, tick)  # Preempção e volta à fila
+                processor.release_process(tick)
+                insort(idle, processor_id)
+            dispatched = self.dispatch(tick, idle)
+            if policy.preemptive and arrived:
+                dispatched += self.dispatch_preemption(tick, running, finish_ticks, dispatches)
+
+            # Execução do tick corrente
+            for processor_id in dispatched:
+                process = self.processors[processor_id].current_process
+                dispatches[processor_id] += 1
+                finish_ticks[processor_id] = tick + process.remaining_time
+                time_slice = policy.time_slice(process)
+                if time_slice is not None and process.remaining_time > time_slice:
+                    slice_lengths[processor_id] = time_slice
+                    heapq.heappush(slices, (tick + time_slice, processor_id, dispatches[processor_id]))
+                else:
+                    heapq.heappush(completions, (finish_ticks[processor_id] - 1, processor_id, dispatches[processor_id]))
+                    if policy.preemptive:
+                        heapq.heappush(running, (-finish_ticks[processor_id], processor_id, dispatches[processor_id]))
+            while completions and completions[0][0] == tick:
+                _, processor_id, dispatch = heapq.heappop(completions)
+                if dispatch != dispatches[processor_id]:
+                    continue  # Processo preemptado antes de terminar
+                processor = self.processors[processor_id]
+                processor.current_process.remaining_time = 0
+                processor.release_process(tick)
+                insort(idle, processor_id)
+
+            # Próximo evento
+            if idle and policy.has_ready():
+                tick += 1
+            else:
+                tick = total_ticks
+                if next_arrival is not None:
+                    tick = min(tick, next_arrival[0])
+                if completions:
+                    tick = min(tick, completions[0][0])
+                if slices:
+                    tick = min(tick, slices[0][0])
+
+        self.current_time = total_ticks
+        self.next_pid = process_id
+        if total_ticks > 0:
+            for processor in self.processors:
+                processor.update_idle_time(total_ticks - 1)
+        for processor in self.processors:
+            # Processos ainda em execução: desconta os ticks já executados
+            if processor.current_process is not None:
+                processor.current_process.remaining_time = finish_ticks[processor.id] - total_ticks
+
+    def dispatch(self, current_time: int, idle: List[int]) -> List[int]:
+        # Atribui processos da fila aos processadores ociosos, em ordem de ID
+        policy = self.scheduler.policy
+        if not idle or not policy.has_ready():
+            return []
+        dispatched = []
+        while idle and policy.has_ready():
+            processor_id = idle.pop(0)
+            self.processors[processor_id].assign_process(policy.select_next(current_time), current_time)
+            dispatched.append(processor_id)
+        return dispatched
+
+    def dispatch_preemption(self, current_time: int, running: list, finish_ticks: List[int],
+                            dispatches: List[int]) -> List[int]:
+        # SRTF: como Scheduler.schedule_preemption, troca o processo que termina por
+        # último (topo do heap) enquanto houver um pronto com tempo restante menor
+        policy = self.scheduler.policy
+        dispatched = []
+        while running and policy.has_ready():
+            _, processor_id, dispatch = running[0]
+            processor = self.processors[processor_id]
+            if dispatch != dispatches[processor_id] or processor.current_process is None:
+                heapq.heappop(running)
+                continue
+            remaining = finish_ticks[processor_id] - current_time
+            if not policy.should_preempt(remaining):
+                break
+            heapq.heappop(running)
+            dispatches[processor_id] += 1  # Invalida o término já agendado
+            processor.current_process.remaining_time = remaining
+            policy.on_preempt(processor.current_process, current_time)
+            processor.release_process(current_time)
+            processor.assign_process(policy.select_next(current_time), current_time)
+            dispatched.append(processor_id)
+        return dispatched
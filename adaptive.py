@@ -0,0 +1,179 @@
+import contextlib
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from replications import map_replications, run_replication
+from Simulation import DEFAULT_DURATION_RANGE, Simulation
+from streaming import RunningStats
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_REPLICATIONS = 5000
+MIN_REPLICATIONS = 30  # Abaixo disso o desvio padrão amostral é pouco confiável
+# Opções de replicação que a AntitheticSimulation não implementa (ela sorteia a carga por inversão)
+ANTITHETIC_UNSUPPORTED = ('workload', 'trace', 'run_queues', 'warmup')
+
+
+def half_width(stats: RunningStats, confianca: float = 0.95) -> float:
+    # Meia largura do intervalo de confiança normal para a média
+    if stats.count < 2:
+        return math.inf
+    z = statistics.NormalDist().inv_cdf((1 + confianca) / 2)
+    return z * stats.stdev() / math.sqrt(stats.count)
+
+
+class AntitheticSimulation(Simulation):
+    """Simulation que sorteia chegadas, durações e prioridades por inversão.
+
+    Cada fonte de aleatoriedade tem seu próprio gerador, derivado da
+    SeedSequence da replicação. Com antithetic=True cada uniforme u vira
+    1 - u, de modo que as duas execuções de um par ficam negativamente
+    correlacionadas. Roda sempre no motor orientado a eventos.
+    """
+
+    def __init__(self, num_processors: int, scheduling_algorithm: str, arrival_rate: float, quantum: int,
+                 seed_sequence: np.random.SeedSequence, antithetic: bool = False,
+                 duration_range: tuple = DEFAULT_DURATION_RANGE) -> None:
+        super().__init__(num_processors, scheduling_algorithm, arrival_rate, quantum, duration_range=duration_range)
+        arrivals, durations, priorities = seed_sequence.spawn(3)
+        self.arrival_rng = np.random.default_rng(arrivals)
+        self.duration_rng = np.random.default_rng(durations)
+        self.priority_rng = np.random.default_rng(priorities)
+        self.antithetic = antithetic
+        # CDF da Binomial(10, arrival_rate) para a inversão das chegadas
+        pmf = [math.comb(10, k) * arrival_rate ** k * (1 - arrival_rate) ** (10 - k) for k in range(11)]
+        self.arrival_cdf = np.cumsum(pmf)
+
+    def uniforms(self, rng: np.random.Generator, size: Optional[int] = None):
+        u = rng.random(size)
+        return 1 - u if self.antithetic else u
+
+    def draw_arrivals(self, size: int) -> np.ndarray:
+        u = self.uniforms(self.arrival_rng, size)
+        return np.minimum(np.searchsorted(self.arrival_cdf, u, side='right'), 10)
+
+    def create_process(self, pid: int):
+        low, high = self.duration_range
+        duration = min(low + int(self.uniforms(self.duration_rng) * (high - low + 1)), high)
+        priority = min(1 + int(self.uniforms(self.priority_rng) * 5), 5)
+        self.add_process(pid, duration, priority)
+
+    def simulate(self, total_time: int) -> None:
+        self.simulate_events(total_time)
+
+
+def check_antithetic(config: dict) -> None:
+    unsupported = [key for key in ANTITHETIC_UNSUPPORTED if config.get(key)]
+    if unsupported:
+        raise ValueError(f"Replicações antitéticas não suportam: {', '.join(unsupported)}")
+
+
+def replication_pool(workers: Optional[int]):
+    # Um único pool para todos os lotes (no processo atual com workers=1)
+    workers = workers or os.cpu_count() or 1
+    return ProcessPoolExecutor(max_workers=workers) if workers > 1 else contextlib.nullcontext()
+
+
+def run_antithetic_pair(config: dict, master_seed: int, index: int) -> float:
+    # Média do par (u, 1 - u) da replicação `index`
+    check_antithetic(config)
+    seed_sequence = np.random.SeedSequence(master_seed, spawn_key=(index,))
+    idle_times = []
+    for antithetic in (False, True):
+        sim = AntitheticSimulation(
+            config["num_processors"],
+            config["scheduling_algorithm"],
+            config["arrival_rate"],
+            config.get('quantum', None),
+            seed_sequence,
+            antithetic,
+            config.get('duration_range', DEFAULT_DURATION_RANGE)
+        )
+        sim.simulate_events(config["total_simulation_time"])
+        idle_times.append(sim.get_average_idle_time())
+    return sum(idle_times) / 2
+
+
+def run_adaptive(config: dict, tolerance: float, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_replications: int = DEFAULT_MAX_REPLICATIONS, confianca: float = 0.95,
+                 master_seed: int = 0, workers: Optional[int] = None, antithetic: bool = False) -> Dict:
+    """Roda lotes de replicações até a meia largura do IC ficar abaixo de `tolerance`.
+
+    O critério é verificado após cada lote (e nunca antes de MIN_REPLICATIONS
+    amostras). Com antithetic=True cada amostra é a média de um par antitético,
+    e o limite max_replications conta pares.
+    """
+    if antithetic:
+        check_antithetic(config)
+    replication = run_antithetic_pair if antithetic else run_replication
+    stats = RunningStats()
+    samples: List[float] = []
+    index = 0
+    with replication_pool(workers) as executor:
+        while index < max_replications:
+            batch = list(range(index, min(index + batch_size, max_replications)))
+            for idle_time in map_replications(config, batch, master_seed, workers, replication=replication,
+                                              executor=executor):
+                stats.add(idle_time)
+                samples.append(idle_time)
+            index = batch[-1] + 1
+            if stats.count >= MIN_REPLICATIONS and half_width(stats, confianca) <= tolerance:
+                break
+    return summarize(stats, samples, confianca)
+
+
+def run_adaptive_crn(config: dict, algorithms: List[str], tolerance: float, batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_replications: int = DEFAULT_MAX_REPLICATIONS, confianca: float = 0.95,
+                     master_seed: int = 0, workers: Optional[int] = None, antithetic: bool = False) -> Dict:
+    """Compara algoritmos com números aleatórios comuns (CRN).
+
+    A replicação i de cada algoritmo usa a mesma semente, então as diferenças
+    em relação ao primeiro algoritmo têm variância reduzida. Para quando a
+    meia largura do IC de todas as diferenças fica abaixo de `tolerance`.
+    """
+    if antithetic:
+        check_antithetic(config)
+    replication = run_antithetic_pair if antithetic else run_replication
+    stats = {algorithm: RunningStats() for algorithm in algorithms}
+    samples = {algorithm: [] for algorithm in algorithms}
+    differences = {algorithm: RunningStats() for algorithm in algorithms[1:]}
+    index = 0
+    with replication_pool(workers) as executor:
+        while index < max_replications:
+            batch = list(range(index, min(index + batch_size, max_replications)))
+            batch_results = {
+                algorithm: list(map_replications(dict(config, scheduling_algorithm=algorithm), batch, master_seed,
+                                                 workers, replication=replication, executor=executor))
+                for algorithm in algorithms
+            }
+            for i in range(len(batch)):
+                for algorithm in algorithms:
+                    stats[algorithm].add(batch_results[algorithm][i])
+                    samples[algorithm].append(batch_results[algorithm][i])
+                for algorithm in algorithms[1:]:
+                    differences[algorithm].add(batch_results[algorithm][i] - batch_results[algorithms[0]][i])
+            index = batch[-1] + 1
+            targets = differences.values() if differences else stats.values()
+            if index >= MIN_REPLICATIONS and all(half_width(s, confianca) <= tolerance for s in targets):
+                break
+    return {
+        'algorithms': {algorithm: summarize(stats[algorithm], samples[algorithm], confianca) for algorithm in algorithms},
+        'differences': {f"{algorithm} - {algorithms[0]}": summarize(differences[algorithm], [], confianca)
+                        for algorithm in algorithms[1:]},
+    }
+
+
+def summarize(stats: RunningStats, samples: List[float], confianca: float) -> Dict:
+    width = half_width(stats, confianca)
+    return {
+        'mean': stats.mean,
+        'stdev': stats.stdev(),
+        'replications': stats.count,
+        'half_width': width,
+        'interval': (stats.mean - width, stats.mean + width),
+        'samples': samples,
+    }
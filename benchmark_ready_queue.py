@@ -0,0 +1,61 @@
+import random
+import time
+from collections import deque
+
+from Process import Process
+from ReadyQueue import BucketQueue, HeapQueue
+
+# Tamanhos de fila avaliados (10 a 10^6 processos)
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+MAX_SORTED_SIZE = 10_000  # A fila ordenada a cada pop é quadrática; limita o tamanho
+
+
+def make_processes(n: int) -> list:
+    return [Process(pid, 0, random.randint(1, 10), random.randint(1, 5)) for pid in range(n)]
+
+
+def bench_heap(processes: list) -> float:
+    # Insere todos e retira todos da fila em heap; retorna ns por operação
+    queue = HeapQueue(lambda p: p.remaining_time)
+    start = time.perf_counter()
+    for process in processes:
+        queue.push(process)
+    while queue:
+        queue.pop()
+    return (time.perf_counter() - start) / (2 * len(processes)) * 1e9
+
+
+def bench_bucket(processes: list) -> float:
+    # Fila por nível de prioridade com envelhecimento preguiçoso (políticas aging/mlfq)
+    queue = BucketQueue(5, lambda level, enqueued, now: max(0, level - int((now - enqueued) // 10)))
+    start = time.perf_counter()
+    for now, process in enumerate(processes):
+        queue.push(process, process.priority - 1, now)
+    now = len(processes)
+    while queue:
+        queue.pop(now)
+        now += 1
+    return (time.perf_counter() - start) / (2 * len(processes)) * 1e9
+
+
+def bench_sorted_deque(processes: list) -> float:
+    # Comportamento anterior: reordena o deque inteiro antes de cada retirada
+    queue = deque()
+    start = time.perf_counter()
+    for process in processes:
+        queue.append(process)
+    while queue:
+        queue = deque(sorted(queue, key=lambda p: p.remaining_time))
+        queue.popleft()
+    return (time.perf_counter() - start) / (2 * len(processes)) * 1e9
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    print(f"{'n':>10} {'heap ns/op':>12} {'bucket ns/op':>14} {'sorted ns/op':>14}")
+    for n in SIZES:
+        processes = make_processes(n)
+        heap_ns = bench_heap(processes)
+        bucket_ns = bench_bucket(processes)
+        sorted_ns = f"{bench_sorted_deque(processes):14.0f}" if n <= MAX_SORTED_SIZE else f"{'-':>14}"
+        print(f"{n:>10} {heap_ns:12.0f} {bucket_ns:14.0f} {sorted_ns}")
@@ -0,0 +1,184 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ProcessTable import TableSimulation
+from replications import seed_replication
+from Simulation import DEFAULT_DURATION_RANGE, Simulation
+
+ALGORITHMS = ['fifo', 'sjf', 'round_robin', 'priority', 'SJF-P', 'aging', 'mlfq']
+PROCESSORS = [1, 4, 9, 64]
+ENGINES = ['tick', 'events', 'table', 'multiqueue']  # multiqueue: laço de ticks com filas por processador
+# Carga alvo (utilização oferecida): chegadas por tick x duração média / processadores
+LOADS = {'low': 0.5, 'high': 0.9, 'overloaded': 1.5}
+TOTAL_TIME = 2000
+QUANTUM = 3
+SEED = 0
+REPEATS = 3  # Melhor de N execuções por caso
+BASELINE_PATH = 'benchmark_baseline.json'
+THROUGHPUT_TOLERANCE = 0.10  # Queda relativa tolerada antes de acusar regressão
+RSS_TOLERANCE = 0.20
+COMPARABLE_META = ('seed', 'total_time', 'repeats')  # Precisam coincidir com as do baseline para comparar
+
+
+def arrival_rate(load: str, num_processors: int) -> float:
+    # p da binomial(10, p) que oferece a carga pedida; limitado a 1 (com muitos
+    # processadores a carga máxima possível fica abaixo da pedida)
+    mean_duration = sum(DEFAULT_DURATION_RANGE) / 2
+    return min(1.0, LOADS[load] * num_processors / (10 * mean_duration))
+
+
+def build_cases(algorithms=ALGORITHMS, processors=PROCESSORS, engines=ENGINES, loads=LOADS) -> List[dict]:
+    cases = []
+    for engine, algorithm, load, num_processors in itertools.product(engines, algorithms, loads, processors):
+        cases.append({'engine': engine, 'algorithm': algorithm, 'load': load, 'num_processors': num_processors})
+    return cases
+
+
+def case_id(case: dict) -> str:
+    return f"{case['engine']}/{case['algorithm']}/{case['load']}/{case['num_processors']}"
+
+
+def run_once(case: dict, total_time: int, seed: int) -> tuple:
+    # Uma execução do caso; retorna (segundos, processos criados, tempo ocioso médio)
+    seed_replication(seed, 0)
+    rate = arrival_rate(case['load'], case['num_processors'])
+    start = time.perf_counter()
+    if case['engine'] == 'table':
+        sim = TableSimulation(case['num_processors'], case['algorithm'], rate, QUANTUM)
+        sim.simulate(total_time)
+        jobs = sim.table.size
+    else:
+        run_queues = {} if case['engine'] == 'multiqueue' else None
+        sim = Simulation(case['num_processors'], case['algorithm'], rate, QUANTUM, run_queues=run_queues)
+        if case['engine'] == 'events':
+            sim.simulate_events(total_time)
+        else:
+            sim.simulate(total_time)
+        jobs = len(sim.processes)
+    return time.perf_counter() - start, jobs, sim.get_average_idle_time()
+
+
+def run_case(case: dict, total_time: int = TOTAL_TIME, seed: int = SEED, repeats: int = REPEATS) -> dict:
+    """Mede um caso (chamado em um processo novo, para que o pico de RSS seja só dele)."""
+    runs = [run_once(case, total_time, seed) for _ in range(repeats)]
+    wall_time = min(run[0] for run in runs)
+    jobs, idle_time = runs[0][1], runs[0][2]
+    return {
+        'wall_time': wall_time,
+        'jobs': jobs,
+        'throughput': jobs / wall_time if wall_time else 0.0,  # Processos simulados por segundo
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'idle_time': idle_time,  # Resultado da simulação: muda se a semântica mudar
+    }
+
+
+def run_suite(cases: List[dict], total_time: int = TOTAL_TIME, seed: int = SEED, repeats: int = REPEATS) -> dict:
+    # Cada caso roda em um processo próprio (spawn, um caso por processo)
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for case in cases:
+            result = pool.apply(run_case, (case, total_time, seed, repeats))
+            results[case_id(case)] = result
+            print(f"{case_id(case):<36} {result['throughput']:12.0f} jobs/s {result['peak_rss_kb'] / 1024:8.1f} MB")
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'total_time': total_time,
+            'seed': seed,
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+
+def meta_mismatches(meta: dict, baseline_meta: dict) -> List[str]:
+    # Campos de COMPARABLE_META em que a execução atual difere do baseline
+    return [f"{name} {baseline_meta.get(name)} -> {meta.get(name)}" for name in COMPARABLE_META
+            if meta.get(name) != baseline_meta.get(name)]
+
+
+def compare(current: dict, baseline: dict, throughput_tolerance: float = THROUGHPUT_TOLERANCE,
+            rss_tolerance: float = RSS_TOLERANCE) -> List[str]:
+    """Lista as regressões do resultado atual em relação ao baseline.
+
+    Acusa queda de throughput ou aumento de pico de RSS além das tolerâncias
+    e qualquer mudança no resultado da simulação (idle_time) para a mesma
+    semente. Casos ausentes em um dos lados são ignorados. Levanta
+    ValueError se semente, horizonte ou repetições diferem do baseline.
+    """
+    mismatches = meta_mismatches(current['meta'], baseline['meta'])
+    if mismatches:
+        raise ValueError(f"Baseline não comparável ({', '.join(mismatches)})")
+    problems = []
+    for key, result in current['results'].items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            continue
+        if result['throughput'] < reference['throughput'] * (1 - throughput_tolerance):
+            change = result['throughput'] / reference['throughput'] - 1
+            problems.append(f"{key}: throughput {change:+.1%} ({reference['throughput']:.0f} -> {result['throughput']:.0f} jobs/s)")
+        if result['peak_rss_kb'] > reference['peak_rss_kb'] * (1 + rss_tolerance):
+            change = result['peak_rss_kb'] / reference['peak_rss_kb'] - 1
+            problems.append(f"{key}: pico de RSS {change:+.1%}")
+        if result['idle_time'] != reference['idle_time']:
+            problems.append(f"{key}: resultado mudou ({reference['idle_time']} -> {result['idle_time']})")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark dos motores e escalonadores')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help='grava o resultado como novo baseline')
+    parser.add_argument('--total-time', type=int, default=TOTAL_TIME)
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--engines', nargs='+', default=ENGINES)
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS)
+    parser.add_argument('--processors', nargs='+', type=int, default=PROCESSORS)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if not args.save:
+        try:
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        except FileNotFoundError:
+            print(f"Sem baseline em {args.baseline}; use --save para criar")
+            return 0
+        # Confere antes de rodar: um baseline de outro horizonte ou repetições acusaria mudanças falsas
+        mismatches = meta_mismatches({'seed': SEED, 'total_time': args.total_time, 'repeats': args.repeats},
+                                     baseline['meta'])
+        if mismatches:
+            print(f"Baseline {args.baseline} não comparável ({', '.join(mismatches)}); "
+                  f"rode com os mesmos parâmetros ou use --save")
+            return 1
+
+    cases = build_cases(args.algorithms, args.processors, args.engines)
+    current = run_suite(cases, args.total_time, SEED, args.repeats)
+    if args.save:
+        with open(args.baseline, 'w') as file:
+            json.dump(current, file, indent=2)
+        print(f"Baseline salvo em {args.baseline}")
+        return 0
+
+    problems = compare(current, baseline)
+    for problem in problems:
+        print(f"REGRESSÃO {problem}")
+    if not problems:
+        print("Nenhuma regressão em relação ao baseline")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import argparse
+import itertools
+import sys
+from typing import List, Optional
+
+import vectorized
+from replications import seed_replication
+from Simulation import Simulation
+
+ALGORITHMS = ['fifo', 'sjf', 'round_robin', 'priority', 'srtf', 'aging', 'mlfq']
+PROCESSORS = [1, 4, 9]
+ARRIVAL_RATES = [0.0, 0.05, 0.3, 0.7]
+SEEDS = range(2)
+TOTAL_TIME = 300
+QUANTUM = 3
+
+
+def final_state(algorithm: str, num_processors: int, arrival_rate: float, seed: int, engine: str) -> tuple:
+    # Tudo o que uma execução deixa: processadores, processos e o ponto dos geradores globais
+    seed_replication(seed, 0)
+    sim = Simulation(num_processors, algorithm, arrival_rate, QUANTUM)
+    if engine == 'events':
+        sim.simulate_events(TOTAL_TIME)
+    else:
+        sim.simulate(TOTAL_TIME)
+    processors = [(p.idle_time, p.last_idle_time_update) for p in sim.processors]
+    processes = [(p.pid, p.arrival_time, p.duration, p.remaining_time, p.priority, p.start_time, p.finish_time)
+                 for p in sim.processes]
+    return processors, processes, sim.get_average_idle_time()
+
+
+def check_tick_events(algorithms: List[str] = ALGORITHMS) -> List[str]:
+    """Casos em que o motor de eventos não reproduz exatamente o laço de ticks."""
+    problems = []
+    for algorithm, num_processors, arrival_rate, seed in itertools.product(algorithms, PROCESSORS, ARRIVAL_RATES, SEEDS):
+        if (final_state(algorithm, num_processors, arrival_rate, seed, 'tick')
+                != final_state(algorithm, num_processors, arrival_rate, seed, 'events')):
+            problems.append(f"tick x events: {algorithm}, {num_processors} processadores, taxa {arrival_rate}, semente {seed}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Confere que os motores de simulação dão resultados idênticos')
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS)
+    args = parser.parse_args(argv)
+
+    problems = check_tick_events(args.algorithms)
+    if not vectorized.validate():
+        problems.append("vectorized x Scheduler: divergência (detalhes acima)")
+    for problem in problems:
+        print(f"DIVERGÊNCIA {problem}")
+    if not problems:
+        print("Motores equivalentes: tick, events e vectorized")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import os
+import pickle
+import random
+import sys
+import zlib
+from typing import Callable, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from Simulation import Simulation
+
+MAGIC = b'SIMSTATE'
+VERSION = 1
+HEADER_SIZE = 16  # MAGIC + versão (uint32) + reservado
+COMPRESSION_LEVEL = 6
+CHECKPOINT_INTERVAL = 10000  # Ticks entre checkpoints em run_checkpointed
+
+
+def dumps(sim: Simulation) -> bytes:
+    """Estado completo de uma Simulation (laço de ticks) em bytes compactados.
+
+    Inclui relógio, processos, processadores, escalonador (filas, heaps e
+    temporizadores), workload e o estado dos geradores globais random e
+    numpy, de modo que loads() continua exatamente a mesma execução. Deve
+    ser chamado entre duas chamadas de simulate(). Um workload de trace
+    guarda só o caminho e a posição: o arquivo precisa continuar no mesmo
+    lugar. Vale também para a TableSimulation (ProcessTable).
+    """
+    if sim.workload is not None and not hasattr(sim.workload, 'open_streams'):
+        raise ValueError(f"Workload sem suporte a checkpoint: {type(sim.workload).__name__}")
+    state = {'simulation': sim, 'random': random.getstate(), 'numpy': np.random.get_state()}
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+    return MAGIC + VERSION.to_bytes(4, 'little') + bytes(HEADER_SIZE - len(MAGIC) - 4) + payload
+
+
+def loads(data: bytes) -> Simulation:
+    # Recria a Simulation e restaura os geradores globais no ponto do checkpoint
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Dados não são um checkpoint de simulação")
+    version = int.from_bytes(data[len(MAGIC):len(MAGIC) + 4], 'little')
+    if version != VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {version}")
+    state = pickle.loads(zlib.decompress(data[HEADER_SIZE:]))
+    random.setstate(state['random'])
+    np.random.set_state(state['numpy'])
+    return state['simulation']
+
+
+def save(sim: Simulation, path: str) -> None:
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as file:
+        file.write(dumps(sim))
+    os.replace(tmp, path)  # Um checkpoint interrompido não substitui o anterior
+
+
+def load(path: str) -> Simulation:
+    with open(path, 'rb') as file:
+        return loads(file.read())
+
+
+def fork(data: bytes, algorithms: Iterable[str]) -> Iterator[Tuple[str, Simulation]]:
+    """Uma cópia do estado de `data` para cada algoritmo, com a política trocada.
+
+    As cópias são geradas uma a uma porque cada loads() restaura os geradores
+    globais: execute cada cópia antes de pedir a próxima. Assim todas seguem
+    com os mesmos números aleatórios a partir do checkpoint (CRN), e o
+    aquecimento é simulado uma única vez.
+    """
+    for algorithm in algorithms:
+        sim = loads(data)
+        sim.change_policy(algorithm)
+        yield algorithm, sim
+
+
+def run_checkpointed(build: Callable[[], Simulation], total_time: int, path: str,
+                     interval: int = CHECKPOINT_INTERVAL) -> Simulation:
+    """Roda até total_time gravando um checkpoint a cada `interval` ticks.
+
+    Se `path` já existe (execução anterior interrompida), continua dele em vez
+    de chamar build(); o resultado é o mesmo de uma execução sem interrupção.
+    """
+    sim = load(path) if os.path.exists(path) else build()
+    while sim.current_time < total_time:
+        sim.simulate(min(sim.current_time + interval, total_time))
+        save(sim, path)
+    return sim
+
+
+if __name__ == '__main__':
+    # python checkpoint.py estado.ckpt total_time: continua um checkpoint até total_time
+    sim = load(sys.argv[1])
+    sim.simulate(int(sys.argv[2]))
+    save(sim, sys.argv[1])
+    print(f"t={sim.current_time}: tempo ocioso médio {sim.get_average_idle_time():.2f}")
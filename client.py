@@ -0,0 +1,84 @@
+import argparse
+import json
+import socket
+import sys
+from typing import Iterator, List, Optional
+
+# Cliente leve do server.py: só biblioteca padrão, para não pagar as importações de numpy/scipy
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+def submit(request: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> Iterator[dict]:
+    """Envia um pedido e gera as mensagens do servidor até 'done' ou 'error'."""
+    with socket.create_connection((host, port)) as connection:
+        connection.sendall((json.dumps(request) + '\n').encode())
+        with connection.makefile('r') as lines:
+            for line in lines:
+                message = json.loads(line)
+                yield message
+                if message['type'] in ('done', 'error'):
+                    return
+    raise ConnectionError("O servidor fechou a conexão antes de terminar o job")
+
+
+def load_json(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Cliente do servidor de simulação')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest='job', required=True)
+    simulate = commands.add_parser('simulate', help='replicações de uma configuração (como main.py)')
+    simulate.add_argument('config', nargs='?', default='config.json')
+    simulate.add_argument('-n', '--replications', type=int, default=100)
+    simulate.add_argument('--seed', type=int, default=None)
+    simulate.add_argument('--set', nargs='*', default=[], metavar='CHAVE=VALOR',
+                          help='sobrescreve chaves da configuração (valor em JSON)')
+    sweep = commands.add_parser('sweep', help='grade de configurações (como sweep.py)')
+    sweep.add_argument('sweep', nargs='?', default='sweep.json')
+    commands.add_parser('status')
+    commands.add_parser('shutdown')
+    args = parser.parse_args(argv)
+
+    request = {'job': args.job}
+    if args.job == 'simulate':
+        config = load_json(args.config)
+        for assignment in args.set:
+            key, value = assignment.split('=', 1)
+            try:
+                config[key] = json.loads(value)
+            except ValueError:
+                config[key] = value
+        request.update(config=config, replications=args.replications)
+        if args.seed is not None:
+            request['seed'] = args.seed
+    elif args.job == 'sweep':
+        request['sweep'] = load_json(args.sweep)
+
+    done = 0
+    for message in submit(request, args.host, args.port):
+        if message['type'] == 'partial':
+            if 'cell' in message:
+                done += 1
+                cell = message['cell']
+                source = ' (analítico)' if message.get('analytic') else ''
+                print(f"[{done}] {cell['scheduling_algorithm']}, P={cell['num_processors']}, "
+                      f"taxa={cell['arrival_rate']}: {message['mean_idle_time']:.2f}{source}", file=sys.stderr)
+            else:
+                done += len(message['idle_times'])
+                print(f"{done} replicações concluídas", file=sys.stderr)
+        elif message['type'] == 'error':
+            print(f"Erro: {message['message']}", file=sys.stderr)
+            return 1
+        elif message['type'] == 'done':
+            message.pop('idle_times', None)
+            print(json.dumps(message, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
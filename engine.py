@@ -0,0 +1,183 @@
+import copy
+import heapq
+from itertools import count
+from typing import Callable, Iterator, List, Optional
+
+from policies import Policy
+from tracing import CREATED, DEBUG, FINISHED, INFO, NULL_TRACER, PREEMPTED, RESUMED, STARTED, Tracer
+
+# Tipos de evento
+ARRIVAL = 0
+SLICE_END = 1
+
+
+class Job:
+    """Processo do motor em tempo contínuo (mesmos campos do Process de using_simpy)."""
+
+    __slots__ = ('pid', 'arrival_time', 'duration', 'remaining_time', 'priority', 'start_time',
+                 'first_start_time', 'end_time', 'ready_time', 'added_to_ready_queue', 'preempted', 'level')
+
+    def __init__(self, pid: int, arrival_time: float, duration: float, priority: int = 0) -> None:
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.duration = duration
+        self.remaining_time = duration
+        self.priority = priority
+        self.start_time = None
+        self.first_start_time = None
+        self.end_time = None
+        self.ready_time = 0  # Tempo total na fila de prontos
+        self.added_to_ready_queue = arrival_time
+        self.preempted = False
+        self.level = 0  # Nível atual no MLFQ
+
+
+class Engine:
+    """Motor de eventos discretos em tempo contínuo, guiado por uma Policy.
+
+    Usa um único heap de eventos (chegadas e fins de execução) e nenhuma
+    corrotina por processo. A política decide a ordem da fila de prontos;
+    o motor trata o tempo, os processadores, o quantum (políticas
+    time_sliced) e a preempção na chegada (políticas preemptive).
+    """
+
+    def __init__(self, num_processors: int, policy: Policy, sink=None, retain: bool = True,
+                 tracer: Tracer = NULL_TRACER) -> None:
+        self.now = 0.0
+        self.policy = policy
+        self.sink = sink  # CompletionSink opcional
+        self.tracer = tracer  # Rastreamento de eventos (desligado por padrão)
+        self.retain = retain  # Guarda os jobs criados em self.jobs
+        self.jobs: List[Job] = []
+        self.running: List[Optional[Job]] = [None] * num_processors
+        self.run_start = [0.0] * num_processors  # Início da execução atual de cada processador
+        self.run_length = [0.0] * num_processors  # Duração programada da execução atual
+        self.tokens = [0] * num_processors  # Invalida fins de execução de processos preemptados
+        self.idle = list(range(num_processors))  # Heap de processadores livres
+        self.projected = []  # Preemptivas: heap de (-fim previsto, processador, token) das execuções
+        self.events = []
+        self.sequence = count()  # Desempate dos eventos simultâneos por ordem de criação
+
+    def schedule_event(self, time: float, kind: int, data) -> None:
+        heapq.heappush(self.events, (time, next(self.sequence), kind, data))
+
+    def run(self, until: float, arrival_times: Iterator[float], create_job: Callable[[int, float], Job]) -> None:
+        """Processa os eventos com tempo menor que `until`.
+
+        arrival_times gera os instantes de chegada em ordem e só é avançado
+        depois que a chegada anterior é processada; create_job(pid, tempo)
+        cria o job no instante da chegada. Assim os sorteios aleatórios
+        ocorrem na mesma ordem de um gerador de processos do simpy.
+        """
+        first = next(arrival_times, None)
+        if first is not None:
+            self.schedule_event(first, ARRIVAL, 0)
+        events = self.events
+        while events and events[0][0] < until:
+            self.now, _, kind, data = heapq.heappop(events)
+            if kind == ARRIVAL:
+                job = create_job(data, self.now)
+                if self.retain:
+                    self.jobs.append(job)
+                self.arrive(job)
+                next_time = next(arrival_times, None)
+                if next_time is not None:
+                    self.schedule_event(next_time, ARRIVAL, data + 1)
+            else:
+                processor, token = data
+                if token == self.tokens[processor]:
+                    self.end_run(processor)
+
+    def arrive(self, job: Job) -> None:
+        job.added_to_ready_queue = self.now
+        if self.tracer.level >= INFO:
+            self.tracer.emit(CREATED, self.now, job.pid, job.duration)
+        self.policy.on_arrival(job, self.now)
+        if self.idle:
+            self.dispatch()
+        elif self.policy.preemptive:
+            self.check_preemption()
+
+    def dispatch(self) -> None:
+        # Ocupa os processadores livres com os próximos processos da política
+        while self.idle and self.policy.has_ready():
+            self.start(heapq.heappop(self.idle), self.policy.select_next(self.now))
+
+    def start(self, processor: int, job: Job) -> None:
+        job.ready_time += self.now - job.added_to_ready_queue
+        job.start_time = self.now
+        if self.tracer.level >= DEBUG:
+            self.tracer.emit(RESUMED if job.preempted else STARTED, self.now, job.pid)
+        if job.first_start_time is None:
+            job.first_start_time = self.now
+        length = job.remaining_time
+        time_slice = self.policy.time_slice(job)
+        if time_slice is not None:
+            length = min(time_slice, length)
+        self.running[processor] = job
+        self.run_start[processor] = self.now
+        self.run_length[processor] = length
+        self.tokens[processor] += 1
+        if self.policy.preemptive:
+            if len(self.projected) > 4 * len(self.running):
+                self.projected = [entry for entry in self.projected if self.is_current(entry[1], entry[2])]
+                heapq.heapify(self.projected)
+            heapq.heappush(self.projected, (-(self.now + length), processor, self.tokens[processor]))
+        self.schedule_event(self.now + length, SLICE_END, (processor, self.tokens[processor]))
+
+    def end_run(self, processor: int) -> None:
+        job = self.running[processor]
+        self.running[processor] = None
+        job.remaining_time -= self.run_length[processor]
+        if job.remaining_time > 0:
+            # Fim do quantum: volta para a fila
+            job.added_to_ready_queue = self.now
+            job.preempted = True
+            if self.tracer.level >= DEBUG:
+                self.tracer.emit(PREEMPTED, self.now, job.pid)
+            self.policy.on_preempt(job, self.now)
+        else:
+            self.finish(job)
+        heapq.heappush(self.idle, processor)
+        self.dispatch()
+
+    def finish(self, job: Job) -> None:
+        job.end_time = self.now
+        if self.tracer.level >= INFO:
+            self.tracer.emit(FINISHED, self.now, job.pid)
+        if self.sink is not None:
+            self.sink.add(job.ready_time, job.end_time - job.arrival_time, job.first_start_time - job.arrival_time)
+
+    def is_current(self, processor: int, token: int) -> bool:
+        # A entrada de self.projected ainda é a execução atual do processador?
+        return token == self.tokens[processor] and self.running[processor] is not None
+
+    def check_preemption(self) -> None:
+        # Preempta o processo que termina por último (topo de self.projected, com
+        # as entradas antigas descartadas ao chegar ao topo) se a política indicar um melhor
+        projected = self.projected
+        while projected and not self.is_current(projected[0][1], projected[0][2]):
+            heapq.heappop(projected)
+        if not projected:
+            return
+        victim = projected[0][1]
+        victim_remaining = self.running[victim].remaining_time - (self.now - self.run_start[victim])
+        if self.policy.should_preempt(victim_remaining):
+            heapq.heappop(projected)
+            job = self.running[victim]
+            job.remaining_time = victim_remaining
+            job.added_to_ready_queue = self.now
+            job.preempted = True
+            if self.tracer.level >= DEBUG:
+                self.tracer.emit(PREEMPTED, self.now, job.pid)
+            self.policy.on_preempt(job, self.now)
+            self.start(victim, self.policy.select_next(self.now))
+
+    def events_processed(self) -> int:
+        # Eventos retirados do heap: cada evento agendado consumiu um número da sequência
+        return next(copy.copy(self.sequence)) - len(self.events)
+
+    def average_ready_time(self) -> float:
+        # Tempo médio na fila de prontos dos jobs concluídos
+        completed = [job for job in self.jobs if job.end_time is not None]
+        return sum(job.ready_time for job in completed) / len(completed) if completed else 0
@@ -0,0 +1,211 @@
+import io
+import mmap
+import os
+import sys
+from collections import deque
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+# Registro de um job no formato binário (e nos blocos lidos de CSV)
+JOB_DTYPE = np.dtype([('arrival', '<f8'), ('duration', '<f8'), ('priority', '<i4')])
+MAGIC = b'JOBTRACE'
+HEADER_SIZE = 16  # MAGIC + versão (uint32) + reservado
+VERSION = 1
+CHUNK_RECORDS = 1 << 20  # Registros por bloco lido do arquivo
+CSV_CHUNK_BYTES = 32 << 20
+
+
+def is_binary_trace(path: str) -> bool:
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def parse_csv_chunk(data: bytes) -> np.ndarray:
+    # Linhas "chegada,duração,prioridade" -> vetor JOB_DTYPE
+    text = data.replace(b'\r', b'').strip()
+    if not text:
+        return np.zeros(0, dtype=JOB_DTYPE)
+    try:
+        values = np.loadtxt(io.BytesIO(text), delimiter=',', ndmin=2)
+    except ValueError:
+        values = None
+    if values is None or values.shape[1] != 3:
+        raise ValueError("Linha inválida no trace CSV (esperado: chegada,duração,prioridade)")
+    chunk = np.empty(len(values), dtype=JOB_DTYPE)
+    chunk['arrival'] = values[:, 0]
+    chunk['duration'] = values[:, 1]
+    chunk['priority'] = values[:, 2]
+    return chunk
+
+
+def csv_chunks(path: str, chunk_bytes: int = CSV_CHUNK_BYTES) -> Iterator[np.ndarray]:
+    """Lê um trace CSV mapeado em memória, em blocos que terminam em fim de linha.
+
+    Uma primeira linha não numérica é tratada como cabeçalho.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        size = len(data)
+        start = 0
+        first_end = data.find(b'\n')
+        first_line = data[:first_end if first_end >= 0 else size]
+        try:
+            float(first_line.split(b',')[0])
+        except ValueError:
+            start = first_end + 1 if first_end >= 0 else size
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                # Recua até o último fim de linha do bloco (ou avança, se a linha for maior que o bloco)
+                newline = data.rfind(b'\n', start, end)
+                if newline < 0:
+                    newline = data.find(b'\n', end)
+                end = size if newline < 0 else newline + 1
+            yield parse_csv_chunk(data[start:end])
+            start = end
+
+
+def binary_chunks(path: str, chunk_records: int = CHUNK_RECORDS, skip: int = 0) -> Iterator[np.ndarray]:
+    # Fatias de um np.memmap a partir do registro `skip`: só o bloco corrente é lido do disco
+    with open(path, 'rb') as file:
+        header = file.read(HEADER_SIZE)
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} não é um trace binário de jobs")
+    version = int.from_bytes(header[len(MAGIC):len(MAGIC) + 4], 'little')
+    if version != VERSION:
+        raise ValueError(f"Versão de trace não suportada: {version}")
+    if os.path.getsize(path) == HEADER_SIZE:
+        return
+    records = np.memmap(path, dtype=JOB_DTYPE, mode='r', offset=HEADER_SIZE)
+    for start in range(skip, len(records), chunk_records):
+        yield np.array(records[start:start + chunk_records])
+
+
+def skip_records(chunks: Iterable[np.ndarray], skip: int) -> Iterator[np.ndarray]:
+    for chunk in chunks:
+        if skip < len(chunk):
+            yield chunk[skip:]
+            skip = 0
+        else:
+            skip -= len(chunk)
+
+
+def job_chunks(path: str, skip: int = 0) -> Iterator[np.ndarray]:
+    # Blocos JOB_DTYPE de um trace binário ou CSV (detectado pelo cabeçalho), sem os `skip` primeiros jobs
+    if is_binary_trace(path):
+        return binary_chunks(path, skip=skip)
+    return skip_records(csv_chunks(path), skip)
+
+
+def trace_signature(path: str) -> list:
+    # Tamanho e mtime do arquivo: mudam quando o trace é regravado
+    info = os.stat(path)
+    return [info.st_size, info.st_mtime_ns]
+
+
+def iter_jobs(path: str) -> Iterator[tuple]:
+    # (chegada, duração, prioridade) de cada job, em ordem
+    for chunk in job_chunks(path):
+        yield from zip(chunk['arrival'].tolist(), chunk['duration'].tolist(), chunk['priority'].tolist())
+
+
+def write_binary_trace(path: str, chunks: Iterable[np.ndarray]) -> int:
+    # Grava blocos JOB_DTYPE no formato binário; retorna o número de jobs
+    count = 0
+    with open(path, 'wb') as file:
+        file.write(MAGIC + VERSION.to_bytes(4, 'little') + bytes(HEADER_SIZE - len(MAGIC) - 4))
+        for chunk in chunks:
+            file.write(np.ascontiguousarray(chunk, dtype=JOB_DTYPE).tobytes())
+            count += len(chunk)
+    return count
+
+
+def convert_csv(csv_path: str, binary_path: str) -> int:
+    return write_binary_trace(binary_path, csv_chunks(csv_path))
+
+
+class TraceWorkload:
+    """Workload do laço de ticks lido de um trace de jobs.
+
+    Tem a interface usada por Simulation (take_arrivals e next_job): cada job
+    chega no tick floor(chegada) e dura ceil(duração) ticks (no mínimo 1). O
+    trace é lido em blocos e precisa estar ordenado por chegada; apenas os
+    jobs dos ticks já entregues e ainda não criados ficam em memória. Só o
+    caminho e a posição (tick e jobs entregues) são serializados: na
+    retomada o arquivo é reaberto a partir dessa posição.
+    """
+
+    cursors = ('chunks', 'ticks', 'durations', 'priorities', 'offset', 'last_tick', 'pending', 'next_job')
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.open_streams()
+
+    def open_streams(self, consumed: Optional[Dict[str, int]] = None) -> None:
+        # Mesmas chaves de Workload.open_streams: ticks entregues ('arrivals') e jobs criados ('duration')
+        consumed = consumed or {}
+        self.tick = consumed.get('arrivals', 0)  # Primeiro tick ainda não entregue
+        self.jobs = consumed.get('duration', 0)  # Jobs do trace já colocados em pending
+        self.chunks = None  # Aberto no primeiro load_chunk, pulando os jobs já entregues
+        self.ticks = np.zeros(0, dtype=np.int64)
+        self.durations = np.zeros(0, dtype=np.int64)
+        self.priorities = np.zeros(0, dtype=np.int64)
+        self.offset = 0
+        self.last_tick = 0
+        self.pending = deque()
+        self.next_job = self.pending.popleft
+
+    def __getstate__(self) -> dict:
+        state = {name: value for name, value in self.__dict__.items() if name not in self.cursors}
+        state['jobs'] = self.jobs - len(self.pending)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.path = state['path']
+        self.open_streams({'arrivals': state['tick'], 'duration': state['jobs']})
+
+    def load_chunk(self) -> bool:
+        if self.chunks is None:
+            self.chunks = job_chunks(self.path, self.jobs)
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        ticks = np.floor(chunk['arrival']).astype(np.int64)
+        if len(ticks) and (ticks[0] < self.last_tick or np.any(np.diff(ticks) < 0)):
+            raise ValueError("O trace precisa estar ordenado por chegada")
+        self.ticks = ticks
+        self.durations = np.maximum(1, np.ceil(chunk['duration'])).astype(np.int64)
+        self.priorities = chunk['priority'].astype(np.int64)
+        self.offset = 0
+        if len(ticks):
+            self.last_tick = int(ticks[-1])
+        return True
+
+    def take_arrivals(self, size: int) -> np.ndarray:
+        # Chegadas por tick nos próximos `size` ticks
+        end = self.tick + size
+        counts = np.zeros(size, dtype=np.int64)
+        while True:
+            if self.offset == len(self.ticks) and not self.load_chunk():
+                break
+            stop = self.offset + int(np.searchsorted(self.ticks[self.offset:], end))
+            if stop > self.offset:
+                ticks = self.ticks[self.offset:stop]
+                if ticks[0] < self.tick:
+                    raise ValueError("O trace precisa estar ordenado por chegada")
+                counts += np.bincount(ticks - self.tick, minlength=size)
+                self.pending.extend(zip(self.durations[self.offset:stop].tolist(),
+                                        self.priorities[self.offset:stop].tolist()))
+                self.jobs += stop - self.offset
+                self.offset = stop
+            if self.offset < len(self.ticks):
+                break
+        self.tick = end
+        return counts
+
+
+if __name__ == '__main__':
+    # python jobtrace.py entrada.csv saida.jobs
+    print(f"{convert_csv(sys.argv[1], sys.argv[2])} jobs gravados em {sys.argv[2]}")
@@ -1,12 +1,18 @@
 import json
+import os
 from tqdm import tqdm
 import statistics
 
+import matplotlib
+matplotlib.use('Agg')  # Sem janela: o histograma só é gravado em arquivo
 import matplotlib.pyplot as plt
 import numpy as np
 import scipy.stats as stats
 
-from Simulation import Simulation
+from ResultCache import DEFAULT_MAX_BYTES, ResultCache
+from adaptive import DEFAULT_BATCH_SIZE, run_adaptive
+from profiling import aggregate, format_report
+from replications import iter_replications, map_replications, run_profiled_replication
 
 
 def load_config(filename: str) -> dict:
@@ -27,21 +33,68 @@ def calcular_intervalo_confianca(media: float, desvio_padrao: float, tamanho_amo
     
     return limite_inferior, limite_superior
 
-def run_simulations_and_plot(num_simulations: int, config: dict) -> None:
+def run_profiled_simulations(num_simulations: int, config: dict) -> list:
+    # Com 'profile', cada replicação é executada (sem cache) com contadores e timers
+    summaries = []
+    replications = map_replications(
+        config,
+        list(range(num_simulations)),
+        master_seed=config.get('seed', 0),
+        workers=config.get('workers', None),
+        chunksize=config.get('chunksize', None),
+        replication=run_profiled_replication
+    )
+    with tqdm(total=(num_simulations)) as pbar:
+        for summary in replications:
+            summaries.append(summary)
+            pbar.update(1)
+    print(format_report(aggregate(summaries, config["scheduling_algorithm"])))
+    return [summary['idle_time'] for summary in summaries]
+
+def run_fixed_simulations(num_simulations: int, config: dict) -> list:
+    if config.get('profile'):
+        return run_profiled_simulations(num_simulations, config)
     idle_times = []
-    quantum = config.get('quantum', None)  # Quantum para Round Robin
-    # Executa a simulação o número de vezes especificado
+    # Cache opcional: replicações já calculadas com a mesma configuração são reaproveitadas
+    cache = None
+    if config.get('cache_dir'):
+        os.makedirs(config['cache_dir'], exist_ok=True)
+        cache = ResultCache(os.path.join(config['cache_dir'], 'replications.sqlite'),
+                            config.get('cache_max_bytes', DEFAULT_MAX_BYTES))
+    # Executa a simulação o número de vezes especificado, em paralelo
+    replications = iter_replications(
+        config,
+        num_simulations,
+        master_seed=config.get('seed', 0),
+        workers=config.get('workers', None),
+        chunksize=config.get('chunksize', None),
+        cache=cache
+    )
     with tqdm(total=(num_simulations)) as pbar:
-        for i in range(num_simulations):
-            sim = Simulation(
-                config["num_processors"],
-                config["scheduling_algorithm"],
-                config["arrival_rate"],
-                quantum
-            )
-            sim.simulate(config["total_simulation_time"])
-            idle_times.append(sim.get_average_idle_time())
+        for idle_time in replications:
+            idle_times.append(idle_time)
             pbar.update(1)
+    if cache is not None:
+        cache.close()
+    return idle_times
+
+def run_simulations_and_plot(num_simulations: int, config: dict) -> None:
+    if config.get('tolerance'):
+        # Modo adaptativo: para quando o IC fica mais estreito que a tolerância;
+        # num_simulations passa a ser apenas o limite máximo
+        resultado = run_adaptive(
+            config,
+            config['tolerance'],
+            batch_size=config.get('batch_size', DEFAULT_BATCH_SIZE),
+            max_replications=num_simulations,
+            master_seed=config.get('seed', 0),
+            workers=config.get('workers', None),
+            antithetic=config.get('antithetic', False)
+        )
+        idle_times = resultado['samples']
+        num_simulations = len(idle_times)
+    else:
+        idle_times = run_fixed_simulations(num_simulations, config)
     print(statistics.mean(idle_times))
     print(statistics.stdev(idle_times))
     intervalo_confianca = calcular_intervalo_confianca(statistics.mean(idle_times), statistics.stdev(idle_times), num_simulations)
@@ -50,12 +103,11 @@ def run_simulations_and_plot(num_simulations: int, config: dict) -> None:
     plt.hist(idle_times, bins=20, color='skyblue', edgecolor='black')  # 'bins' define o número de intervalos no histograma
     plt.xlabel("Tempo Ocioso Médio")
     plt.ylabel("Frequência")
-    plt.title("Frequência dos Tempos Ociosos Médios (1000 simulações)")
+    plt.title(f"Frequência dos Tempos Ociosos Médios ({num_simulations} simulações)")
 
     # Salvar a imagem
     plt.savefig(f"idle_times_"+ config["scheduling_algorithm"] + ".png")  # Salva a imagem como "idle_times_histogram.png" no diretório atual
-
-    plt.show()  # Mostra o gráfico na tela (opcional)
+    plt.close()
 
 if __name__ == '__main__':
     # Carregar configurações do arquivo JSON
@@ -0,0 +1,235 @@
+from operator import attrgetter
+from typing import Dict, Optional, Type
+
+from ReadyQueue import BucketQueue, FifoQueue, HeapQueue
+
+AGING_INTERVAL = 10  # Ticks de espera para um processo subir um nível de prioridade
+BOOST_INTERVAL = 100  # Ticks entre os reforços de prioridade do MLFQ
+PRIORITY_LEVELS = 5  # Prioridades 1 a 5 (níveis 0 a 4)
+
+# Registro de políticas por nome (nomes do Scheduler e de using_simpy)
+POLICIES: Dict[str, Type['Policy']] = {}
+
+
+def register_policy(*names: str):
+    # Decorador: registra a classe sob um ou mais nomes
+    def decorator(cls):
+        cls.name = names[0]
+        for name in names:
+            POLICIES[name] = cls
+        return cls
+    return decorator
+
+
+def create_policy(name: str, quantum: Optional[float] = None, table=None) -> 'Policy':
+    if name not in POLICIES:
+        raise ValueError(f"Algoritmo de escalonamento desconhecido: {name}")
+    return POLICIES[name](quantum, table)
+
+
+class TableKey:
+    # Chave de uma fila de pids: o campo `field` da ProcessTable (serializável, ao contrário de um lambda)
+    __slots__ = ('table', 'field')
+
+    def __init__(self, table, field: str) -> None:
+        self.table = table
+        self.field = field
+
+    def __call__(self, pid: int):
+        return getattr(self.table, self.field)[pid]
+
+
+class Policy:
+    """Interface comum das políticas de escalonamento.
+
+    Uma política só decide a ordem dos processos prontos: on_arrival e
+    on_preempt devolvem processos à fila e select_next escolhe o próximo.
+    O motor (laço de ticks, motor orientado a eventos ou engine.Engine)
+    cuida do tempo e dos processadores e consulta os atributos
+    time_sliced/preemptive para saber quando interromper um processo.
+
+    Com uma ProcessTable os itens da fila são pids e a chave é lida da tabela.
+    """
+
+    name = ''
+    key_field: Optional[str] = None  # Campo que ordena a fila (None = ordem de chegada)
+    time_sliced = False  # Interrompe o processo ao fim de cada quantum
+    preemptive = False  # Interrompe o processo em execução quando chega um melhor
+
+    def __init__(self, quantum: Optional[float] = None, table=None) -> None:
+        if self.time_sliced and (quantum is None or quantum <= 0):
+            raise ValueError(f"A política {self.name} precisa de um quantum positivo (recebeu {quantum})")
+        self.quantum = quantum
+        self.queue = self.make_queue(table)
+
+    def make_queue(self, table):
+        if self.key_field is None:
+            return FifoQueue()
+        if table is not None:
+            return HeapQueue(TableKey(table, self.key_field))
+        return HeapQueue(attrgetter(self.key_field))
+
+    def on_arrival(self, process, now: float) -> None:
+        self.queue.push(process)
+
+    def on_preempt(self, process, now: float) -> None:
+        self.queue.push(process)
+
+    def on_migrate(self, process, now: float) -> None:
+        # Processo movido entre filas (balanceamento), sem ter executado
+        self.queue.push(process)
+
+    def select_next(self, now: float):
+        return self.queue.pop()
+
+    def take_last(self, count: int, now: float) -> list:
+        # Os `count` processos que a política escolheria por último (roubo e migração entre filas)
+        return self.queue.pop_last(count)
+
+    def has_ready(self) -> bool:
+        return len(self.queue) > 0
+
+    def time_slice(self, process) -> Optional[float]:
+        # Tempo máximo de execução contínua (None = até terminar)
+        return None
+
+    def should_preempt(self, running_remaining: float) -> bool:
+        # O melhor processo pronto deve tomar o lugar de um com esse tempo restante?
+        return False
+
+
+@register_policy('fifo', 'FCFS')
+class FifoPolicy(Policy):
+    pass
+
+
+@register_policy('sjf', 'SJF')
+class SJFPolicy(Policy):
+    key_field = 'remaining_time'
+
+
+@register_policy('priority')
+class PriorityPolicy(Policy):
+    key_field = 'priority'
+
+
+@register_policy('round_robin', 'RR')
+class RoundRobinPolicy(Policy):
+    time_sliced = True
+
+    def time_slice(self, process) -> Optional[float]:
+        return self.quantum
+
+
+@register_policy('srtf', 'SJF-P')
+class SRTFPolicy(Policy):
+    # Shortest Remaining Time First: SJF com preempção na chegada
+    key_field = 'remaining_time'
+    preemptive = True
+
+    def should_preempt(self, running_remaining: float) -> bool:
+        return self.has_ready() and self.queue.peek_key() < running_remaining
+
+
+class LevelPolicy(Policy):
+    """Base das políticas com uma fila FIFO por nível de prioridade (BucketQueue).
+
+    O nível inicial vem do campo priority (1 a 5 viram os níveis 0 a 4);
+    effective() define como a espera altera o nível de quem está na fila.
+    """
+
+    levels = PRIORITY_LEVELS
+
+    def __init__(self, quantum: Optional[float] = None, table=None) -> None:
+        self.table = table
+        super().__init__(quantum, table)
+
+    def make_queue(self, table):
+        return BucketQueue(self.levels, self.effective)
+
+    def effective(self, level: int, enqueued: float, now: float) -> int:
+        return level
+
+    def base_level(self, process) -> int:
+        priority = self.table.priority[process] if self.table is not None else process.priority
+        return min(max(int(priority) - 1, 0), self.levels - 1)
+
+    def on_arrival(self, process, now: float) -> None:
+        self.queue.push(process, self.base_level(process), now)
+
+    def on_preempt(self, process, now: float) -> None:
+        self.queue.push(process, self.base_level(process), now)
+
+    def on_migrate(self, process, now: float) -> None:
+        self.queue.push(process, self.base_level(process), now)
+
+    def select_next(self, now: float):
+        return self.queue.pop(now)[0]
+
+    def take_last(self, count: int, now: float) -> list:
+        return [process for process, _ in self.queue.pop_last(count, now)]
+
+
+@register_policy('aging')
+class AgingPolicy(LevelPolicy):
+    # Prioridade com envelhecimento: sobe um nível a cada aging_interval de espera
+    aging_interval = AGING_INTERVAL
+
+    def effective(self, level: int, enqueued: float, now: float) -> int:
+        return max(0, level - int((now - enqueued) // self.aging_interval))
+
+
+@register_policy('mlfq')
+class MLFQPolicy(LevelPolicy):
+    """Multilevel feedback queue.
+
+    O quantum do nível n é quantum * 2**n; quem usa o quantum inteiro desce
+    um nível. A cada boost_interval todos voltam ao nível 0: o reforço é
+    aplicado na retirada, tratando como nível 0 quem entrou na fila antes
+    do último reforço. O nível atual fica no processo (campo level).
+    """
+
+    time_sliced = True
+    boost_interval = BOOST_INTERVAL
+
+    def effective(self, level: int, enqueued: float, now: float) -> int:
+        return 0 if enqueued // self.boost_interval < now // self.boost_interval else level
+
+    def get_level(self, process) -> int:
+        return int(self.table.level[process]) if self.table is not None else process.level
+
+    def set_level(self, process, level: int) -> None:
+        if self.table is not None:
+            self.table.level[process] = level
+        else:
+            process.level = level
+
+    def on_arrival(self, process, now: float) -> None:
+        level = self.base_level(process)
+        self.set_level(process, level)
+        self.queue.push(process, level, now)
+
+    def on_preempt(self, process, now: float) -> None:
+        # Fim do quantum: desce um nível
+        level = min(self.get_level(process) + 1, self.levels - 1)
+        self.set_level(process, level)
+        self.queue.push(process, level, now)
+
+    def on_migrate(self, process, now: float) -> None:
+        self.queue.push(process, self.get_level(process), now)
+
+    def select_next(self, now: float):
+        process, level = self.queue.pop(now)
+        if level < self.get_level(process):
+            self.set_level(process, level)  # Reforçado enquanto esperava
+        return process
+
+    def take_last(self, count: int, now: float) -> list:
+        taken = self.queue.pop_last(count, now)
+        for process, level in taken:
+            if level < self.get_level(process):
+                self.set_level(process, level)
+        return [process for process, _ in taken]
+
+    def time_slice(self, process) -> Optional[float]:
+        return self.quantum * 2 ** self.get_level(process)
@@ -0,0 +1,113 @@
+import gc
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# Fases do laço de ticks de Simulation.simulate
+PHASES = ('arrivals', 'schedule', 'update')
+
+
+class RunProfile:
+    """Contadores de uma execução (replicação ou instância).
+
+    Só existe quando o perfil é pedido: sem ele, os motores seguem pelo
+    caminho normal, sem nenhum teste ou timer por evento. `events` conta
+    chegadas e términos (laço de ticks) ou os eventos processados pelo
+    motor; `allocated_blocks` é a variação dos blocos alocados pelo
+    interpretador (sys.getallocatedblocks) durante a execução.
+    """
+
+    def __init__(self, label: str = '') -> None:
+        self.label = label
+        self.wall_time = 0.0
+        self.events = 0
+        self.decisions = 0
+        self.decision_time = 0.0
+        self.max_ready = 0  # Maior tamanho da fila de prontos observado
+        self.allocated_blocks = 0
+        self.phases: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self._start = 0.0
+        self._blocks = 0
+
+    def start(self) -> None:
+        gc.collect()  # Lixo de execuções anteriores não entra na contagem de blocos
+        self._blocks = sys.getallocatedblocks()
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        self.wall_time = time.perf_counter() - self._start
+        self.allocated_blocks = sys.getallocatedblocks() - self._blocks
+
+    def observe_ready(self, length: int) -> None:
+        if length > self.max_ready:
+            self.max_ready = length
+
+    def instrument(self, obj, method: str, ready_length: Callable[[], int]) -> None:
+        # Substitui obj.method (na instância) por uma versão cronometrada,
+        # que também registra o tamanho da fila antes de cada decisão
+        original = getattr(obj, method)
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            self.observe_ready(ready_length())
+            start = clock()
+            result = original(*args, **kwargs)
+            self.decision_time += clock() - start
+            self.decisions += 1
+            return result
+
+        setattr(obj, method, timed)
+
+    def summary(self) -> dict:
+        return {
+            'label': self.label,
+            'wall_time': self.wall_time,
+            'events': self.events,
+            'events_per_second': self.events / self.wall_time if self.wall_time else 0.0,
+            'decisions': self.decisions,
+            'decision_time': self.decision_time,
+            'max_ready': self.max_ready,
+            'allocated_blocks': self.allocated_blocks,
+            'phases': dict(self.phases),
+        }
+
+
+def aggregate(summaries: List[dict], label: str = '') -> dict:
+    """Soma um conjunto de resumos (de execuções ou de outros agregados).
+
+    O resultado tem as mesmas chaves de RunProfile.summary mais `runs`, de
+    modo que resumos de células podem ser agregados de novo por sweep.
+    """
+    runs = sum(s.get('runs', 1) for s in summaries)
+    wall_time = sum(s['wall_time'] for s in summaries)
+    events = sum(s['events'] for s in summaries)
+    return {
+        'label': label,
+        'runs': runs,
+        'wall_time': wall_time,
+        'events': events,
+        'events_per_second': events / wall_time if wall_time else 0.0,
+        'decisions': sum(s['decisions'] for s in summaries),
+        'decision_time': sum(s['decision_time'] for s in summaries),
+        'max_ready': max((s['max_ready'] for s in summaries), default=0),
+        'allocated_blocks': sum(s['allocated_blocks'] for s in summaries),
+        'phases': {phase: sum(s['phases'].get(phase, 0.0) for s in summaries) for phase in PHASES},
+    }
+
+
+def format_report(summary: dict) -> str:
+    runs = summary.get('runs', 1)
+    lines = [f"Perfil {summary['label']}".rstrip()]
+    lines.append(f"  execuções:            {runs}")
+    lines.append(f"  tempo total:          {summary['wall_time']:.3f} s")
+    lines.append(f"  eventos/s:            {summary['events_per_second']:.0f} ({summary['events']} eventos)")
+    if summary['decisions']:
+        per_decision = summary['decision_time'] / summary['decisions'] * 1e6
+        lines.append(f"  decisões:             {summary['decisions']} ({per_decision:.2f} us cada)")
+    lines.append(f"  fila de prontos máx.: {summary['max_ready']}")
+    lines.append(f"  blocos alocados:      {summary['allocated_blocks'] / runs:.0f} por execução")
+    total = sum(summary['phases'].values())
+    if total:
+        for phase, seconds in summary['phases'].items():
+            lines.append(f"  fase {phase:<16} {seconds:.3f} s ({seconds / total:.0%})")
+    return '\n'.join(lines)
@@ -0,0 +1,206 @@
+import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterator, List, Optional
+
+import numpy as np
+
+import checkpoint
+import vectorized
+from ResultCache import ResultCache, implementation_version
+from profiling import RunProfile
+from Simulation import DEFAULT_DURATION_RANGE, Simulation
+from jobtrace import TraceWorkload, trace_signature
+from workload import TickWorkload
+
+# Chaves de configuração que não alteram o resultado de uma replicação
+RUNTIME_KEYS = {'engine', 'workers', 'chunksize', 'seed', 'cache_dir', 'cache_max_bytes',
+                'tolerance', 'batch_size', 'antithetic', 'profile'}
+WARMUP_ALGORITHM = 'fifo'  # Política do aquecimento compartilhado (chave 'warmup_algorithm')
+
+
+def seed_replication(master_seed: int, index: int) -> None:
+    """Semeia os geradores globais (random e numpy) para a replicação `index`.
+
+    Cada replicação recebe um fluxo independente derivado da semente mestre
+    (SeedSequence com spawn_key), de modo que o resultado depende apenas de
+    (master_seed, index), e não do processo que a executa.
+    """
+    state = np.random.SeedSequence(master_seed, spawn_key=(index,)).generate_state(4)
+    np.random.seed(state)
+    random.seed(int.from_bytes(state.tobytes(), 'little'))
+
+
+def replication_workload(config: dict, master_seed: int, index: int):
+    # Com workload='batched', a replicação sorteia a carga em blocos de um Generator próprio
+    # (resultados diferentes do fluxo padrão random/np.random, mas igualmente reprodutíveis);
+    # com 'trace', os jobs vêm de um trace (CSV ou binário) e todas as replicações são iguais
+    if config.get('trace'):
+        return TraceWorkload(config['trace'])
+    if config.get('workload') != 'batched':
+        return None
+    seed = np.random.SeedSequence(master_seed, spawn_key=(index,))
+    return TickWorkload(config["arrival_rate"], config.get('duration_range', DEFAULT_DURATION_RANGE), seed)
+
+
+def build_simulation(config: dict, profile: Optional[RunProfile] = None, workload=None) -> Simulation:
+    return Simulation(
+        config["num_processors"],
+        config["scheduling_algorithm"],
+        config["arrival_rate"],
+        config.get('quantum', None),
+        duration_range=config.get('duration_range', DEFAULT_DURATION_RANGE),
+        profile=profile,
+        workload=workload,
+        run_queues=config.get('run_queues')
+    )
+
+
+def warm_up(config: dict, master_seed: int, index: int) -> Simulation:
+    """Simula os primeiros config['warmup'] ticks da replicação `index`.
+
+    O aquecimento usa a mesma política (warmup_algorithm) para qualquer
+    algoritmo, então o estado ao fim dele pode ser bifurcado em vários
+    (checkpoint.fork). As métricas só contam a partir do fim do aquecimento.
+    """
+    seed_replication(master_seed, index)
+    warmup_config = dict(config, scheduling_algorithm=config.get('warmup_algorithm', WARMUP_ALGORITHM))
+    sim = build_simulation(warmup_config, workload=replication_workload(config, master_seed, index))
+    sim.simulate(config['warmup'])
+    return sim
+
+
+def measure(sim: Simulation, config: dict) -> float:
+    # Do fim do aquecimento até total_simulation_time (laço de ticks, que continua do estado atual)
+    sim.reset_statistics()
+    sim.simulate(config["total_simulation_time"])
+    return sim.get_average_idle_time()
+
+
+def run_forked_replication(config: dict, algorithms: List[str], master_seed: int, index: int) -> List[float]:
+    # Um aquecimento, bifurcado em cada algoritmo: mesmos resultados de run_replication para cada um
+    data = checkpoint.dumps(warm_up(config, master_seed, index))
+    return [measure(sim, config) for _, sim in checkpoint.fork(data, algorithms)]
+
+
+def run_replication(config: dict, master_seed: int, index: int) -> float:
+    # Executa uma replicação e retorna o tempo ocioso médio dos processadores
+    if config.get('engine') == 'vectorized':
+        return vectorized.idle_times(config, master_seed, [index])[0]
+    if config.get('warmup'):
+        sim = warm_up(config, master_seed, index)
+        sim.change_policy(config["scheduling_algorithm"])
+        return measure(sim, config)
+    seed_replication(master_seed, index)
+    sim = build_simulation(config, workload=replication_workload(config, master_seed, index))
+    if config.get('engine', 'tick') == 'events':
+        sim.simulate_events(config["total_simulation_time"])
+    else:
+        sim.simulate(config["total_simulation_time"])
+    return sim.get_average_idle_time()
+
+
+def run_profiled_replication(config: dict, master_seed: int, index: int) -> dict:
+    """Executa uma replicação com RunProfile e retorna o resumo do perfil.
+
+    O tempo ocioso médio (o mesmo de run_replication) vem em 'idle_time'.
+    O motor 'events' não tem fases: mede apenas o tempo total e as alocações.
+    """
+    if config.get('warmup'):
+        raise ValueError("O perfil não suporta aquecimento (warmup)")
+    seed_replication(master_seed, index)
+    profile = RunProfile(f"{config['scheduling_algorithm']} #{index}")
+    sim = build_simulation(config, profile, replication_workload(config, master_seed, index))
+    if config.get('engine', 'tick') == 'events':
+        profile.start()
+        sim.simulate_events(config["total_simulation_time"])
+        profile.stop()
+    else:
+        sim.simulate(config["total_simulation_time"])
+    return dict(profile.summary(), idle_time=sim.get_average_idle_time())
+
+
+def map_replications(config: dict, indices: list, master_seed: int = 0,
+                     workers: Optional[int] = None, chunksize: Optional[int] = None,
+                     replication: Callable[[dict, int, int], float] = run_replication,
+                     executor: Optional[Executor] = None) -> Iterator[float]:
+    """Executa as replicações de `indices`, gerando os resultados na mesma ordem.
+
+    As replicações são distribuídas em um pool de processos, submetidas em
+    blocos de `chunksize`. Com workers=1 tudo roda no processo atual. O
+    resultado é idêntico para qualquer número de workers. `replication` é a
+    função executada para cada índice (precisa ser serializável por pickle).
+    Quem chama em lotes pode passar `executor` para reaproveitar o mesmo pool.
+    Com engine='vectorized', run_replication roda em blocos de replicações
+    (vectorized.idle_times), um bloco por tarefa do pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    if config.get('engine') == 'vectorized' and replication is run_replication:
+        vectorized.check_config(config)
+        # Blocos limitados pela memória e repartidos entre os workers
+        size = min(vectorized.chunk_size(config), -(-len(indices) // workers)) if indices else 1
+        chunks = [indices[start:start + size] for start in range(0, len(indices), size)]
+        for idle_times in map_replications(config, chunks, master_seed, workers, 1, vectorized.idle_times, executor):
+            yield from idle_times
+        return
+    task = partial(replication, config, master_seed)
+    if workers == 1 or len(indices) <= 1:
+        yield from map(task, indices)
+        return
+    if chunksize is None:
+        # Alguns blocos por worker equilibram a carga sem excesso de comunicação
+        chunksize = max(1, len(indices) // (workers * 4))
+    if executor is not None:
+        yield from executor.map(task, indices, chunksize=chunksize)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(task, indices, chunksize=chunksize)
+
+
+def cache_config(config: dict) -> dict:
+    # Apenas as chaves que afetam o resultado entram na chave do cache
+    # (os motores 'tick' e 'events' produzem resultados idênticos; o 'vectorized' sorteia outra
+    # carga e entra na chave); um trace entra também pela assinatura do arquivo, para que
+    # regravá-lo no mesmo caminho invalide o cache
+    key = {key: value for key, value in config.items() if key not in RUNTIME_KEYS}
+    if config.get('engine') == 'vectorized':
+        key['engine'] = 'vectorized'
+    if config.get('trace'):
+        key['trace_signature'] = trace_signature(config['trace'])
+    return key
+
+
+def iter_replications(config: dict, num_simulations: int, master_seed: int = 0,
+                      workers: Optional[int] = None, chunksize: Optional[int] = None,
+                      cache: Optional[ResultCache] = None) -> Iterator[float]:
+    """Gera os tempos ociosos médios das replicações, na ordem dos índices.
+
+    Com um ResultCache, as replicações já calculadas para a mesma
+    configuração, versão da implementação e semente são reaproveitadas e só
+    as que faltam são executadas.
+    """
+    if cache is None:
+        yield from map_replications(config, list(range(num_simulations)), master_seed, workers, chunksize)
+        return
+    version = implementation_version()
+    keys = [cache.key(cache_config(config), version, master_seed, i) for i in range(num_simulations)]
+    cached = cache.get_many(keys)
+    missing = [i for i in range(num_simulations) if keys[i] not in cached]
+    computed = map_replications(config, missing, master_seed, workers, chunksize)
+    try:
+        for i in range(num_simulations):
+            if keys[i] in cached:
+                yield cached[keys[i]]
+            else:
+                idle_time = next(computed)
+                cache.put(keys[i], idle_time)
+                yield idle_time
+    finally:
+        cache.flush()
+
+
+def run_replications(config: dict, num_simulations: int, master_seed: int = 0,
+                     workers: Optional[int] = None, chunksize: Optional[int] = None,
+                     cache: Optional[ResultCache] = None) -> list:
+    return list(iter_replications(config, num_simulations, master_seed, workers, chunksize, cache))
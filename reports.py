@@ -0,0 +1,243 @@
+import argparse
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from ResultCache import implementation_version
+from ResultsStore import ResultsStore
+from streaming import BinnedHistogram, RunningStats
+
+DISPLAY_BINS = 10  # Intervalos desenhados (mesmo número do plt.hist de metrics)
+CSV_CHUNK_ROWS = 65536  # Linhas lidas por bloco dos CSVs de resultados
+MANIFEST_NAME = 'reports_manifest.json'
+RESULTS_PATTERN = 'average_ready_times_*.csv'
+READY_TIMES_NAME = re.compile(r'average_ready_times_(\d+)_(\w+)$')
+
+
+class CsvSource:
+    """CSV de resultados (uma linha por instância, uma coluna por algoritmo).
+
+    A primeira coluna (Instance) é ignorada. A assinatura é o tamanho e o
+    mtime do arquivo: se não mudarem, as figuras não são refeitas.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.id = path
+
+    def signature(self) -> list:
+        info = os.stat(self.path)
+        return [info.st_size, info.st_mtime_ns]
+
+    def read(self) -> Dict[str, tuple]:
+        # Uma passada em blocos: estatísticas e histograma de todas as colunas
+        summaries: Dict[str, tuple] = {}
+        for chunk in pd.read_csv(self.path, chunksize=CSV_CHUNK_ROWS):
+            for column in chunk.columns[1:]:
+                if column not in summaries:
+                    summaries[column] = (RunningStats(), BinnedHistogram())
+                values = chunk[column].to_numpy(dtype=float)
+                values = values[~np.isnan(values)]
+                for accumulator in summaries[column]:
+                    accumulator.add_many(values)
+        return summaries
+
+    def output_name(self, column: str) -> str:
+        # average_ready_times_4_high.csv -> histogram_<coluna>_high_4.png
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        match = READY_TIMES_NAME.match(stem)
+        if match:
+            stem = f'{match.group(2)}_{match.group(1)}'
+        return f'histogram_{column}_{stem}.png'
+
+
+class StoreSource:
+    """Uma coluna de uma partição do ResultsStore, lida bloco a bloco (mmap).
+
+    A assinatura é a lista de blocos .npy da coluna com tamanho e mtime.
+    """
+
+    def __init__(self, root: str, keys: Dict[str, str], column: str = 'average_ready_time') -> None:
+        self.store = ResultsStore(root)
+        self.keys = keys
+        self.column = column
+        self.id = os.path.join(self.store.partition_path(**keys), column)
+        self.name = keys.get('algorithm', column)
+
+    def signature(self) -> list:
+        entries = []
+        for file in self.store.chunk_files(self.column, **self.keys):
+            info = os.stat(file)
+            entries.append([os.path.relpath(file, self.store.root), info.st_size, info.st_mtime_ns])
+        return entries
+
+    def read(self) -> Dict[str, tuple]:
+        accumulators = (RunningStats(), BinnedHistogram())
+        for chunk in self.store.column_chunks(self.column, **self.keys):
+            values = np.asarray(chunk, dtype=float)
+            values = values[~np.isnan(values)]
+            for accumulator in accumulators:
+                accumulator.add_many(values)
+        return {self.name: accumulators}
+
+    def output_name(self, column: str) -> str:
+        # Mesmo nome de antes: histogram_<algoritmo>_<processadores>_<taxa>.png
+        return 'histogram_' + '_'.join(self.keys.values()) + '.png'
+
+
+def store_sources(root: str, column: str = 'average_ready_time', **filters) -> List[StoreSource]:
+    # Partições do store cujas chaves batem com os filtros (comparados como texto)
+    return [StoreSource(root, keys, column) for keys in ResultsStore(root).partitions()
+            if all(keys.get(name) == str(value) for name, value in filters.items())]
+
+
+def summarize(running: RunningStats) -> dict:
+    # Desvio padrão populacional e IC t de 95%, como a análise original de metrics.py
+    std_dev = float(np.sqrt(running.m2 / running.count)) if running.count else float('nan')
+    if running.count > 1:
+        conf_interval = stats.t.interval(0.95, running.count - 1, loc=running.mean,
+                                         scale=std_dev / np.sqrt(running.count))
+    else:
+        conf_interval = (float('nan'), float('nan'))
+    return {
+        'Mean': running.mean if running.count else float('nan'),
+        'Standard Deviation': std_dev,
+        '95% Confidence Interval': tuple(float(bound) for bound in conf_interval),
+    }
+
+
+def coarsen(edges: np.ndarray, counts: np.ndarray, bins: int) -> tuple:
+    # Junta intervalos finos vizinhos até sobrarem no máximo `bins` na faixa ocupada
+    occupied = np.flatnonzero(counts)
+    if len(occupied) == 0:
+        return edges, counts
+    first, last = occupied[0], occupied[-1] + 1
+    group = max(1, -(-(last - first) // bins))
+    counts = counts[first:last]
+    counts = np.pad(counts, (0, -len(counts) % group)).reshape(-1, group).sum(axis=1)
+    width = (edges[1] - edges[0]) * group
+    return edges[first] + width * np.arange(len(counts) + 1), counts
+
+
+def render_histogram(job: dict) -> str:
+    """Desenha uma figura a partir do histograma pré-agrupado (backend Agg).
+
+    Roda nos processos do pool: recebe apenas contagens e estatísticas, não
+    as amostras.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    edges, counts = coarsen(np.asarray(job['edges']), np.asarray(job['counts']), job['bins'])
+    mean = job['stats']['Mean']
+    lower, upper = job['stats']['95% Confidence Interval']
+    plt.figure(figsize=(10, 6))
+    plt.hist(edges[:-1], bins=edges, weights=counts, alpha=0.7, label=job['column'])
+    plt.axvline(mean, color='red', linestyle='dashed', linewidth=2, label='Mean')
+    plt.axvline(lower, color='green', linestyle='dashed', linewidth=2, label='95% CI Lower')
+    plt.axvline(upper, color='green', linestyle='dashed', linewidth=2, label='95% CI Upper')
+    plt.title(f"Histogram of {job['column']}")
+    plt.xlabel('Time')
+    plt.ylabel('Frequency')
+    plt.legend()
+    plt.grid()
+    plt.savefig(job['output'])
+    plt.close()
+    return job['output']
+
+
+def load_manifest(path: str) -> dict:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp, path)
+
+
+def build_reports(sources: list, output_dir: str = '.', bins: int = DISPLAY_BINS,
+                  workers: Optional[int] = None, force: bool = False) -> Dict[str, Dict[str, dict]]:
+    """Estatísticas e histogramas de vários arquivos de resultados de uma vez.
+
+    Cada fonte é lida uma única vez, em blocos, alimentando RunningStats e
+    BinnedHistogram por coluna; as figuras são desenhadas em paralelo por um
+    pool de processos. O manifesto em output_dir guarda a assinatura de cada
+    fonte (arquivos, parâmetros e versão deste código) e as estatísticas:
+    fontes inalteradas cujas figuras existem não são lidas nem redesenhadas.
+    Retorna {id da fonte: {coluna: estatísticas}}.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    version = implementation_version(['reports', 'streaming'])
+    results = {}
+    jobs = []
+    for source in sources:
+        signature = {'inputs': source.signature(), 'bins': bins, 'version': version}
+        entry = manifest.get(source.id)
+        if (not force and entry and entry['signature'] == signature
+                and all(os.path.exists(os.path.join(output_dir, figure['output']))
+                        for figure in entry['figures'].values())):
+            results[source.id] = {column: dict(figure['stats']) for column, figure in entry['figures'].items()}
+            for summary in results[source.id].values():
+                summary['95% Confidence Interval'] = tuple(summary['95% Confidence Interval'])
+            continue
+        figures = {}
+        for column, (running, histogram) in source.read().items():
+            summary = summarize(running)
+            output = source.output_name(column)
+            figures[column] = {'output': output, 'stats': summary}
+            jobs.append({'output': os.path.join(output_dir, output), 'column': column, 'bins': bins,
+                         'edges': histogram.edges(), 'counts': histogram.counts, 'stats': summary})
+        manifest[source.id] = {'signature': signature, 'figures': figures}
+        results[source.id] = {column: figure['stats'] for column, figure in figures.items()}
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(render_histogram, jobs))
+    else:
+        for job in jobs:
+            render_histogram(job)
+    save_manifest(manifest_path, manifest)
+    print(f"{len(jobs)} figuras desenhadas, {sum(len(r) for r in results.values()) - len(jobs)} inalteradas")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Estatísticas e histogramas dos arquivos de resultados')
+    parser.add_argument('inputs', nargs='*', help=f'CSVs de resultados (padrão: {RESULTS_PATTERN})')
+    parser.add_argument('--store', help='raiz de um ResultsStore (todas as partições)')
+    parser.add_argument('--column', default='average_ready_time')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--bins', type=int, default=DISPLAY_BINS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='redesenha mesmo as figuras inalteradas')
+    args = parser.parse_args(argv)
+
+    sources = [CsvSource(path) for path in args.inputs or sorted(glob.glob(RESULTS_PATTERN))]
+    if args.store:
+        sources += store_sources(args.store, args.column)
+    results = build_reports(sources, args.output_dir, args.bins, args.workers, args.force)
+    for source_id, columns in results.items():
+        print(source_id)
+        for column, summary in columns.items():
+            print(f"  {column}: média {summary['Mean']:.2f}, desvio {summary['Standard Deviation']:.2f}, "
+                  f"IC 95% ({summary['95% Confidence Interval'][0]:.2f}, {summary['95% Confidence Interval'][1]:.2f})")
+
+
+if __name__ == '__main__':
+    main()
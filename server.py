@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from main import calcular_intervalo_confianca
+from replications import run_replication
+from sweep import analytic_cell, build_grid, estimate_cost, fork_groups, run_cell_group
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_REPLICATIONS = 100
+REQUEST_LIMIT = 16 * 1024 * 1024  # Tamanho máximo de uma linha de pedido (o padrão do asyncio é 64 KiB)
+
+
+def warm_worker() -> None:
+    # Inicializador do pool: paga as importações pesadas uma vez por worker, não por job
+    import numpy  # noqa: F401
+    import scipy.stats  # noqa: F401
+    import Simulation  # noqa: F401
+    import replications  # noqa: F401
+
+
+def try_analytic(cell: dict, analytic: str) -> tuple:
+    # (célula, resultado analítico ou None): os resultados voltam fora de ordem
+    return cell, analytic_cell(cell, analytic)
+
+
+def run_chunk(config: dict, master_seed: int, indices: List[int]) -> tuple:
+    # Um bloco de replicações; os índices voltam junto porque os blocos terminam fora de ordem
+    return indices, [run_replication(config, master_seed, index) for index in indices]
+
+
+class SimulationServer:
+    """Serviço de simulação de longa duração (asyncio) sobre um pool de processos aquecido.
+
+    Protocolo: uma mensagem JSON por linha. Cada pedido ('simulate',
+    'sweep', 'status' ou 'shutdown') recebe 'accepted', zero ou mais
+    'partial' à medida que os blocos terminam e um 'done' (ou 'error').
+    Conexões diferentes rodam ao mesmo tempo e dividem o pool; os pedidos de
+    uma mesma conexão são atendidos em ordem. Uma linha acima de
+    REQUEST_LIMIT recebe 'error' e encerra a conexão; 'shutdown' responde e
+    então cancela as conexões abertas.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        self.next_job = 0
+        self.jobs = {}  # job_id -> descrição dos jobs em andamento
+        self.connections = set()  # Tarefas de handle() ativas, canceladas no desligamento
+        self.stopped = asyncio.Event()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def send(message: dict) -> None:
+            writer.write((json.dumps(message) + '\n').encode())
+            await writer.drain()
+
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while not self.stopped.is_set():
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Linha acima de REQUEST_LIMIT: o resto dela não tem como ser separado do próximo pedido
+                    await send({'type': 'error', 'message': f"Pedido maior que {REQUEST_LIMIT} bytes"})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("O pedido deve ser um objeto JSON")
+                    handler = getattr(self, 'job_' + str(request.get('job')), None)
+                    if handler is None:
+                        raise ValueError(f"Job desconhecido: {request.get('job')}")
+                except ValueError as error:
+                    await send({'type': 'error', 'message': str(error)})
+                    continue
+                self.next_job += 1
+                job_id = self.next_job
+                self.jobs[job_id] = request['job']
+                await send({'type': 'accepted', 'job_id': job_id})
+                try:
+                    await send(dict(await handler(request, send), type='done', job_id=job_id))
+                except (ConnectionError, asyncio.CancelledError):
+                    raise
+                except Exception as error:
+                    await send({'type': 'error', 'job_id': job_id, 'message': f"{type(error).__name__}: {error}"})
+                finally:
+                    del self.jobs[job_id]
+                if request['job'] == 'shutdown':
+                    self.stopped.set()  # Só depois do 'done': serve() cancela as conexões, inclusive esta
+                    break
+        except ConnectionError:
+            pass  # Cliente desconectou no meio de um job
+        except asyncio.CancelledError:
+            # Desligamento: termina normalmente (uma tarefa cancelada aqui gera um traceback no asyncio)
+            if not self.stopped.is_set():
+                raise
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    async def run_tasks(self, tasks: list, on_result) -> list:
+        """Submete (função, argumentos) ao pool e entrega cada resultado a on_result assim que termina.
+
+        Se o cliente desconectar, as tarefas que ainda não começaram são canceladas.
+        """
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(self.executor, function, *args) for function, args in tasks]
+        try:
+            results = []
+            for future in asyncio.as_completed(futures):
+                results.append(await future)
+                await on_result(results[-1])
+            return results
+        finally:
+            for future in futures:
+                future.cancel()
+
+    async def job_simulate(self, request: dict, send) -> dict:
+        # Replicações de uma configuração (as mesmas de main.py), em blocos de índices
+        config = request['config']
+        replications = request.get('replications', DEFAULT_REPLICATIONS)
+        master_seed = request.get('seed', config.get('seed', 0))
+        chunksize = request.get('chunksize') or max(1, replications // (self.workers * 4))
+        chunks = [list(range(start, min(start + chunksize, replications)))
+                  for start in range(0, replications, chunksize)]
+
+        async def send_chunk(result: tuple) -> None:
+            await send({'type': 'partial', 'indices': result[0], 'idle_times': result[1]})
+
+        results = await self.run_tasks([(run_chunk, (config, master_seed, chunk)) for chunk in chunks], send_chunk)
+        idle_times = [idle_time for _, idle_time in sorted(
+            (index, idle_time) for indices, times in results for index, idle_time in zip(indices, times))]
+        mean = statistics.mean(idle_times)
+        stdev = statistics.stdev(idle_times) if len(idle_times) > 1 else 0.0
+        return {
+            'replications': len(idle_times),
+            'mean_idle_time': mean,
+            'stdev_idle_time': stdev,
+            'confidence_interval': list(calcular_intervalo_confianca(mean, stdev, len(idle_times))),
+            'idle_times': idle_times,
+        }
+
+    async def job_sweep(self, request: dict, send) -> dict:
+        # Células da grade (como sweep.run_sweep, sem checkpoint em disco); com 'warmup' os grupos compartilham o
+        # aquecimento, e com 'analytic' as células em que o modelo é confiável não são simuladas
+        analytic = request['sweep'].get('analytic')
+        sweep = {key: value for key, value in request['sweep'].items() if key != 'analytic'}
+        cells = sorted(build_grid(sweep), key=estimate_cost)
+
+        async def send_cells(group_results: list) -> None:
+            for result in group_results:
+                await send({'type': 'partial', 'cell': result['cell'], 'mean_idle_time': result['mean_idle_time'],
+                            'confidence_interval': result['confidence_interval'], 'analytic': 'analytic' in result})
+
+        async def send_estimated(estimation: tuple) -> None:
+            if estimation[1] is not None:
+                await send_cells([estimation[1]])
+
+        estimated = 0
+        if analytic:
+            estimations = await self.run_tasks([(try_analytic, (cell, analytic)) for cell in cells], send_estimated)
+            estimated = sum(result is not None for _, result in estimations)
+            cells = sorted((cell for cell, result in estimations if result is None), key=estimate_cost)
+        groups = fork_groups(cells) if sweep.get('warmup') else [[cell] for cell in cells]
+        results = await self.run_tasks([(run_cell_group, (group,)) for group in groups], send_cells)
+        return {'cells': estimated + sum(len(group_results) for group_results in results), 'estimated': estimated}
+
+    async def job_status(self, request: dict, send) -> dict:
+        return {'workers': self.workers, 'jobs': {str(job_id): job for job_id, job in self.jobs.items()}}
+
+    async def job_shutdown(self, request: dict, send) -> dict:
+        # handle() para o servidor depois de responder
+        return {}
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        # Aquece os workers antes de aceitar conexões
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, warm_worker) for _ in range(self.workers)))
+        server = await asyncio.start_server(self.handle, host, port, limit=REQUEST_LIMIT)
+        print(f"Servidor de simulação em {host}:{port} ({self.workers} workers)")
+        async with server:
+            await self.stopped.wait()
+            # Encerra as conexões abertas (jobs em andamento são cancelados) antes de fechar o servidor
+            for task in self.connections:
+                task.cancel()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Servidor de simulação (JSON por linha em localhost)')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+    asyncio.run(SimulationServer(args.workers).serve(args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
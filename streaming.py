@@ -0,0 +1,200 @@
+import math
+from bisect import bisect_right, insort
+from typing import Dict, Sequence
+
+import numpy as np
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+HISTOGRAM_BINS = 1024  # Intervalos (finos) de BinnedHistogram
+
+
+class RunningStats:
+    """Média e variância online (algoritmo de Welford), em memória constante."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def add_many(self, values) -> None:
+        # Um bloco inteiro: média e M2 do bloco combinados pela fórmula de Chan
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(np.square(values - mean).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def variance(self) -> float:
+        # Variância amostral
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stdev(self) -> float:
+        return math.sqrt(self.variance())
+
+
+class P2Quantile:
+    """Estimador de quantil P² (Jain e Chlamtac), com cinco marcadores.
+
+    Não guarda as observações: mantém apenas as alturas e posições dos
+    marcadores, ajustadas por interpolação parabólica a cada valor.
+    """
+
+    def __init__(self, p: float) -> None:
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            insort(q, x)
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect_right(q, x) - 1
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajusta os marcadores centrais que se afastaram da posição desejada
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def value(self) -> float:
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            # Poucas observações: quantil exato
+            return self.heights[min(int(self.p * self.count), self.count - 1)]
+        return self.heights[2]
+
+
+class BinnedHistogram:
+    """Histograma em memória constante, com `bins` intervalos de mesma largura.
+
+    A faixa começa na do primeiro bloco; quando um valor cai fora dela, a
+    largura dobra (pares de intervalos vizinhos são somados) até cobri-lo.
+    Os intervalos antigos ficam contidos nos novos, então nenhuma contagem
+    é redistribuída por interpolação.
+    """
+
+    def __init__(self, bins: int = HISTOGRAM_BINS) -> None:
+        if bins < 2 or bins % 2:
+            raise ValueError("bins deve ser par")
+        self.bins = bins
+        self.low = 0.0
+        self.width = 0.0
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def add_many(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return
+        low, high = float(values.min()), float(values.max())
+        if self.width == 0.0:
+            self.low = low
+            self.width = (high - low) / self.bins or 1.0
+        half = self.bins // 2
+        while low < self.low:
+            # Dobra para a esquerda: a faixa antiga vira a metade direita
+            self.counts = np.concatenate([np.zeros(half, dtype=np.int64), self.counts.reshape(half, 2).sum(axis=1)])
+            self.low -= self.width * self.bins
+            self.width *= 2
+        while high > self.low + self.width * self.bins:
+            self.counts = np.concatenate([self.counts.reshape(half, 2).sum(axis=1), np.zeros(half, dtype=np.int64)])
+            self.width *= 2
+        index = np.minimum(((values - self.low) / self.width).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+    def edges(self) -> np.ndarray:
+        return self.low + self.width * np.arange(self.bins + 1)
+
+
+class MetricStream:
+    # Estatísticas online de uma métrica: média/variância e quantis P²
+    def __init__(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> None:
+        self.stats = RunningStats()
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def add(self, x: float) -> None:
+        self.stats.add(x)
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    def summary(self) -> Dict[str, float]:
+        summary = {
+            'count': self.stats.count,
+            'mean': self.stats.mean,
+            'stdev': self.stats.stdev(),
+            'min': self.stats.min,
+            'max': self.stats.max,
+        }
+        for p, estimator in self.quantiles.items():
+            summary[f'p{p * 100:g}'] = estimator.value()
+        return summary
+
+
+class CompletionSink:
+    """Destino em fluxo para processos concluídos.
+
+    Cada processo concluído é reduzido a espera, turnaround e resposta, que
+    alimentam acumuladores online; o processo em si não é guardado, então a
+    memória fica constante qualquer que seja a duração da simulação.
+    """
+
+    METRICS = ('wait', 'turnaround', 'response')
+
+    def __init__(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> None:
+        self.quantiles = quantiles
+        self.reset()
+
+    def reset(self) -> None:
+        self.metrics = {name: MetricStream(self.quantiles) for name in self.METRICS}
+
+    def add(self, wait: float, turnaround: float, response: float) -> None:
+        self.metrics['wait'].add(wait)
+        self.metrics['turnaround'].add(turnaround)
+        self.metrics['response'].add(response)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: metric.summary() for name, metric in self.metrics.items()}
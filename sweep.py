@@ -0,0 +1,203 @@
+import hashlib
+import itertools
+import json
+import os
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from analytic import estimate, estimate_hybrid
+from main import calcular_intervalo_confianca, load_config
+from policies import POLICIES
+from profiling import aggregate, format_report
+from replications import RUNTIME_KEYS, map_replications, run_forked_replication, run_profiled_replication, run_replications
+from Simulation import DEFAULT_DURATION_RANGE
+
+# Eixos da grade e seus valores padrão (quando ausentes do arquivo de sweep)
+GRID_AXES = {
+    'scheduling_algorithm': ['fifo', 'sjf', 'round_robin', 'priority'],
+    'num_processors': [1, 4],
+    'arrival_rate': [0.3, 0.7],
+    'quantum': [3],
+    'duration_range': [list(DEFAULT_DURATION_RANGE)],
+}
+# Chaves que não entram na identidade de uma célula (a semente entra: muda as replicações)
+CELL_RUNTIME_KEYS = (RUNTIME_KEYS - {'seed'}) | {'checkpoint_dir', 'analytic'}
+
+
+def build_grid(sweep: dict) -> List[dict]:
+    """Expande a grade do sweep em uma lista de células (configurações).
+
+    Chaves de GRID_AXES são listas de valores; as demais chaves
+    (total_simulation_time, replications, seed...) são copiadas para todas as
+    células. O quantum só varia para as políticas com time_sliced (round_robin,
+    mlfq...), evitando células repetidas.
+    """
+    axes = {name: sweep.get(name, default) for name, default in GRID_AXES.items()}
+    fixed = {key: value for key, value in sweep.items() if key not in GRID_AXES}
+    cells = []
+    seen = set()
+    for values in itertools.product(*axes.values()):
+        cell = dict(fixed, **dict(zip(axes, values)))
+        policy = POLICIES.get(cell['scheduling_algorithm'])
+        if policy is None or not policy.time_sliced:
+            cell['quantum'] = axes['quantum'][0]
+        cell_id = cell_key(cell)
+        if cell_id not in seen:
+            seen.add(cell_id)
+            cells.append(cell)
+    return cells
+
+
+def cell_key(cell: dict) -> str:
+    # Mudar workers, profile ou checkpoint_dir não invalida os checkpoints das células
+    # (o motor 'vectorized' sorteia outra carga, então entra na identidade, como em cache_config)
+    identity = {key: value for key, value in cell.items() if key not in CELL_RUNTIME_KEYS}
+    if cell.get('engine') == 'vectorized':
+        identity['engine'] = 'vectorized'
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def estimate_cost(cell: dict) -> float:
+    # Custo relativo: ticks x (processadores + chegadas por tick) x replicações
+    arrivals_per_tick = 10 * cell['arrival_rate']
+    return cell['total_simulation_time'] * (cell['num_processors'] + arrivals_per_tick) * cell.get('replications', 1)
+
+
+def checkpoint_path(checkpoint_dir: str, cell: dict) -> str:
+    return os.path.join(checkpoint_dir, cell_key(cell) + '.json')
+
+
+def run_cell(cell: dict) -> dict:
+    # Executa todas as replicações de uma célula no processo atual
+    replications = cell.get('replications', 1)
+    profile = None
+    if cell.get('profile'):
+        summaries = list(map_replications(cell, list(range(replications)), cell.get('seed', 0), workers=1,
+                                          replication=run_profiled_replication))
+        idle_times = [summary['idle_time'] for summary in summaries]
+        profile = aggregate(summaries, summarize_cell(cell))
+    else:
+        idle_times = run_replications(cell, replications, cell.get('seed', 0), workers=1)
+    return cell_result(cell, idle_times, profile)
+
+
+def cell_result(cell: dict, idle_times: List[float], profile: Optional[dict] = None) -> dict:
+    mean = statistics.mean(idle_times)
+    stdev = statistics.stdev(idle_times) if len(idle_times) > 1 else 0.0
+    return {
+        'cell': cell,
+        'mean_idle_time': mean,
+        'stdev_idle_time': stdev,
+        'confidence_interval': list(calcular_intervalo_confianca(mean, stdev, len(idle_times))),
+        'idle_times': idle_times,
+        'profile': profile,
+    }
+
+
+def fork_groups(cells: List[dict]) -> List[List[dict]]:
+    # Células que só diferem no algoritmo (compartilham o aquecimento de cada replicação)
+    groups: Dict[str, List[dict]] = {}
+    for cell in cells:
+        rest = {key: value for key, value in cell.items() if key != 'scheduling_algorithm'}
+        groups.setdefault(cell_key(rest), []).append(cell)
+    return list(groups.values())
+
+
+def run_cell_group(cells: List[dict]) -> List[dict]:
+    """Executa um grupo de fork_groups; com 'warmup', cada replicação é aquecida
+    uma vez e bifurcada em todos os algoritmos do grupo (mesmo resultado de run_cell)."""
+    if len(cells) == 1 or not cells[0].get('warmup') or cells[0].get('profile'):
+        return [run_cell(cell) for cell in cells]
+    algorithms = [cell['scheduling_algorithm'] for cell in cells]
+    runs = [run_forked_replication(cells[0], algorithms, cells[0].get('seed', 0), index)
+            for index in range(cells[0].get('replications', 1))]
+    return [cell_result(cell, [run[i] for run in runs]) for i, cell in enumerate(cells)]
+
+
+def analytic_result(cell: dict, estimation: dict) -> dict:
+    # Resultado de uma célula resolvida pelo modelo analítico, sem replicações
+    return {
+        'cell': cell,
+        'mean_idle_time': estimation['idle_time'],
+        'stdev_idle_time': 0.0,
+        'confidence_interval': [estimation['idle_time'], estimation['idle_time']],
+        'idle_times': [],
+        'profile': None,
+        'analytic': estimation,
+    }
+
+
+def analytic_cell(cell: dict, analytic: str) -> Optional[dict]:
+    # Resultado do modelo analítico ('prune' ou 'hybrid') se ele for confiável; None se a célula precisa ser simulada
+    estimation = estimate_hybrid(cell, master_seed=cell.get('seed', 0)) if analytic == 'hybrid' else estimate(cell)
+    return analytic_result(cell, estimation) if estimation['confident'] else None
+
+
+def save_checkpoint(path: str, result: dict) -> None:
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as file:
+        json.dump(result, file)
+    os.replace(tmp, path)  # O checkpoint só aparece depois de completo
+
+
+def run_sweep(sweep: dict, checkpoint_dir: str, workers: Optional[int] = None) -> List[dict]:
+    """Executa todas as células da grade em um pool de processos.
+
+    As células mais baratas são submetidas primeiro. Cada célula concluída
+    é gravada em checkpoint_dir; ao rodar de novo, as células já gravadas são
+    carregadas em vez de recalculadas, de modo que um sweep interrompido
+    continua de onde parou. Com sweep['warmup'], as células que só diferem
+    no algoritmo rodam juntas e compartilham o aquecimento (run_cell_group).
+
+    Com sweep['analytic'] = 'prune' (ou 'hybrid', que confere a estimativa
+    com uma pequena amostra), as células em que o modelo de analytic.py é
+    confiável não são simuladas; o resultado delas traz a chave 'analytic'.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    analytic = sweep.get('analytic')
+    sweep = {key: value for key, value in sweep.items() if key != 'analytic'}  # Fora das células (e do cache das replicações)
+    cells = sorted(build_grid(sweep), key=estimate_cost)
+    results: Dict[str, dict] = {}
+    pending = []
+    for cell in cells:
+        path = checkpoint_path(checkpoint_dir, cell)
+        if os.path.exists(path):
+            with open(path) as file:
+                results[cell_key(cell)] = json.load(file)
+            continue
+        result = analytic_cell(cell, analytic) if analytic else None
+        if result is not None:
+            results[cell_key(cell)] = result
+            continue
+        pending.append(cell)
+    pruned = sum(1 for result in results.values() if 'analytic' in result)
+    print(f"{len(cells)} células, {len(cells) - len(pending) - pruned} já concluídas, {pruned} estimadas pelo modelo analítico")
+
+    if pending:
+        groups = fork_groups(pending) if sweep.get('warmup') else [[cell] for cell in pending]
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_cell_group, group) for group in groups]
+            for future in as_completed(futures):
+                for result in future.result():
+                    cell = result['cell']
+                    save_checkpoint(checkpoint_path(checkpoint_dir, cell), result)
+                    results[cell_key(cell)] = result
+                    done += 1
+                    print(f"[{done}/{len(pending)}] {summarize_cell(cell)}: {result['mean_idle_time']:.2f}")
+    ordered = [results[cell_key(cell)] for cell in cells]
+    profiles = [result['profile'] for result in ordered if result.get('profile')]
+    if profiles:
+        print(format_report(aggregate(profiles, 'sweep')))
+    return ordered
+
+
+def summarize_cell(cell: dict) -> str:
+    return ', '.join(f"{name}={cell[name]}" for name in GRID_AXES)
+
+
+if __name__ == '__main__':
+    sweep = load_config(sys.argv[1] if len(sys.argv) > 1 else 'sweep.json')
+    run_sweep(sweep, sweep.get('checkpoint_dir', 'sweep_checkpoints'), sweep.get('workers', None))
@@ -0,0 +1,21 @@
+import pytest
+
+from analytic import estimate
+from sweep import analytic_cell
+
+# Configuração em que o modelo é confiável: fifo, 4 processadores, utilização ~0,55
+CONFIDENT_CELL = {'scheduling_algorithm': 'fifo', 'num_processors': 4, 'arrival_rate': 0.04,
+                  'total_simulation_time': 5000, 'quantum': None}
+
+
+def test_confident_cell_is_pruned():
+    assert estimate(CONFIDENT_CELL)['confident']
+    assert analytic_cell(CONFIDENT_CELL, 'prune') is not None
+
+
+@pytest.mark.parametrize('extra', [{'warmup': 2500}, {'trace': 'jobs.csv'}, {'run_queues': {}}, {'run_queues': {'steal': True}}])
+@pytest.mark.parametrize('analytic', ['prune', 'hybrid'])
+def test_unmodelled_cell_is_never_pruned(extra, analytic):
+    cell = dict(CONFIDENT_CELL, **extra)
+    assert not estimate(cell)['confident']
+    assert analytic_cell(cell, analytic) is None
@@ -0,0 +1,203 @@
+import json
+import math
+import queue
+import struct
+import sys
+import threading
+from typing import Dict, Iterator, List, Optional
+
+# Níveis de rastreamento
+OFF = 0
+INFO = 1  # Criação e término dos processos
+DEBUG = 2  # Também início, retomada e preempção (necessário para o Gantt)
+LEVELS = {'off': OFF, 'info': INFO, 'debug': DEBUG}
+
+# Tipos de evento
+CREATED = 0
+STARTED = 1
+RESUMED = 2
+PREEMPTED = 3
+FINISHED = 4
+EVENT_NAMES = ['created', 'started', 'resumed', 'preempted', 'finished']
+
+# Registro binário: instância, algoritmo, evento, pid, tempo, valor (duração na criação, NaN nos demais)
+RECORD = struct.Struct('<iBBidd')
+DEFAULT_BATCH_SIZE = 4096  # Registros por lote entregue à thread de escrita
+
+
+class TraceWriter:
+    """Escreve registros de eventos em uma thread de fundo.
+
+    Os registros são acumulados em lotes; cada lote cheio é entregue por uma
+    fila à thread, que serializa e grava no arquivo. Formatos: 'jsonl',
+    'binary' (registros RECORD de tamanho fixo) e 'text' (as mesmas linhas
+    que using_simpy imprimia; path=None escreve no stdout).
+    """
+
+    def __init__(self, path: Optional[str], fmt: str = 'jsonl', batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if fmt not in ('jsonl', 'binary', 'text'):
+            raise ValueError(f"Formato de trace desconhecido: {fmt}")
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.buffer = []
+        if path is None:
+            self.file = sys.stdout
+        else:
+            self.file = open(path, 'wb' if fmt == 'binary' else 'w')
+        self.batches = queue.Queue()
+        self.thread = threading.Thread(target=self.drain, daemon=True)
+        self.thread.start()
+
+    def write(self, record: tuple) -> None:
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.batches.put(self.buffer)
+            self.buffer = []
+
+    def drain(self) -> None:
+        serialize = getattr(self, 'serialize_' + self.fmt)
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+            self.file.write(serialize(batch))
+
+    @staticmethod
+    def serialize_jsonl(batch: List[tuple]) -> str:
+        lines = []
+        for instance, algorithm, kind, pid, time, value in batch:
+            record = {'instance': instance, 'algorithm': algorithm, 'event': EVENT_NAMES[kind],
+                      'pid': pid, 'time': time}
+            if kind == CREATED:
+                record['duration'] = value
+            lines.append(json.dumps(record))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def serialize_binary(batch: List[tuple]) -> bytes:
+        return b''.join(RECORD.pack(instance, algorithm, kind, pid, time, math.nan if value is None else value)
+                        for instance, algorithm, kind, pid, time, value in batch)
+
+    @staticmethod
+    def serialize_text(batch: List[tuple]) -> str:
+        lines = []
+        for instance, algorithm, kind, pid, time, value in batch:
+            if kind == CREATED:
+                lines.append(f"Process {pid} created at {time} with duration {value}")
+            else:
+                lines.append(f"Process {pid} {EVENT_NAMES[kind]} at {time}")
+        return '\n'.join(lines) + '\n'
+
+    def close(self) -> None:
+        # Entrega o que restou, espera a thread terminar e fecha o arquivo
+        self.flush()
+        self.batches.put(None)
+        self.thread.join()
+        if self.file is sys.stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Tracer:
+    """Emissor de eventos de uma instância de simulação.
+
+    O código instrumentado testa `tracer.level` antes de chamar emit, de
+    modo que com o nível OFF (NULL_TRACER) o custo é uma comparação de
+    inteiros. sample_every faz com que apenas uma a cada N instâncias seja
+    rastreada (ver for_instance). `algorithm` distingue os algoritmos
+    simulados numa mesma instância.
+    """
+
+    def __init__(self, writer: Optional[TraceWriter] = None, level: int = OFF,
+                 instance: int = 0, sample_every: int = 1, algorithm: int = 0) -> None:
+        self.writer = writer
+        self.level = level if writer is not None else OFF
+        self.instance = instance
+        self.sample_every = sample_every
+        self.algorithm = algorithm
+
+    def for_instance(self, instance: int) -> 'Tracer':
+        # Tracer da instância, ou NULL_TRACER se ela ficar fora da amostragem
+        if self.level == OFF or instance % self.sample_every:
+            return NULL_TRACER
+        return Tracer(self.writer, self.level, instance, self.sample_every)
+
+    def for_algorithm(self, algorithm: int) -> 'Tracer':
+        if self.level == OFF:
+            return NULL_TRACER
+        return Tracer(self.writer, self.level, self.instance, self.sample_every, algorithm)
+
+    def emit(self, kind: int, time: float, pid: int, value: Optional[float] = None) -> None:
+        self.writer.write((self.instance, self.algorithm, kind, pid, time, value))
+
+
+NULL_TRACER = Tracer()
+
+
+def read_trace(path: str) -> Iterator[Dict]:
+    # Lê um trace jsonl ou binário (pela extensão .bin) como dicionários
+    if path.endswith('.bin'):
+        with open(path, 'rb') as file:
+            data = file.read()
+        for instance, algorithm, kind, pid, time, value in RECORD.iter_unpack(data):
+            record = {'instance': instance, 'algorithm': algorithm, 'event': EVENT_NAMES[kind],
+                      'pid': pid, 'time': time}
+            if kind == CREATED:
+                record['duration'] = value
+            yield record
+        return
+    with open(path) as file:
+        for line in file:
+            yield json.loads(line)
+
+
+def gantt_segments(records, instance: int = 0, algorithm: int = 0) -> Dict[int, List[tuple]]:
+    """Intervalos (início, duração) de execução de cada pid de uma instância e algoritmo.
+
+    Um intervalo abre em 'started'/'resumed' e fecha em 'preempted'/'finished';
+    intervalos ainda abertos no fim do trace são descartados.
+    """
+    open_runs: Dict[int, List[float]] = {}
+    segments: Dict[int, List[tuple]] = {}
+    for record in records:
+        if record['instance'] != instance or record['algorithm'] != algorithm:
+            continue
+        event, pid, time = record['event'], record['pid'], record['time']
+        if event in ('started', 'resumed'):
+            open_runs.setdefault(pid, []).append(time)
+        elif event in ('preempted', 'finished') and open_runs.get(pid):
+            start = open_runs[pid].pop(0)
+            segments.setdefault(pid, []).append((start, time - start))
+    return segments
+
+
+def export_gantt(records, output_file: str, instance: int = 0, algorithm: int = 0,
+                 title: Optional[str] = None) -> None:
+    # Gráfico de Gantt (um processo por linha) a partir de um trace no nível DEBUG
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    segments = gantt_segments(records, instance, algorithm)
+    pids = sorted(segments)
+    plt.figure(figsize=(12, max(3, 0.25 * len(pids))))
+    for row, pid in enumerate(pids):
+        plt.broken_barh(segments[pid], (row - 0.4, 0.8))
+    plt.yticks(range(len(pids)), [str(pid) for pid in pids])
+    plt.title(title or f'Gantt - instance {instance}')
+    plt.xlabel('Time')
+    plt.ylabel('Process')
+    plt.grid(axis='x')
+    plt.savefig(output_file)
+    plt.close()
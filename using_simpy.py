@@ -1,10 +1,24 @@
 import csv
+import heapq
+import math
+from collections import deque
 
 import simpy
 import random
 import numpy as np
 from abc import ABC, abstractmethod
 
+from ResultCache import ResultCache, implementation_version, local_dependencies
+from ResultsStore import ResultsStore
+from engine import Engine, Job
+from policies import create_policy
+from profiling import RunProfile, aggregate, format_report
+from tracing import (CREATED, DEBUG, FINISHED, INFO, LEVELS, NULL_TRACER, OFF, PREEMPTED, RESUMED, STARTED,
+                     Tracer, TraceWriter)
+from jobtrace import iter_jobs
+from replications import seed_replication
+from workload import ContinuousWorkload
+
 # Constants
 NUM_PROCESSORS = 4        # Fixed number of processors
 QUANTUM = 1               # Quantum for Round Robin (updated to 1 unit)
@@ -16,6 +30,16 @@ NUM_INSTANCES = 5000       # Number of instances to simulate
 MAX_PROCESSES = None
 
 CSV_FILE_PATH = 'average_ready_times.csv'  # CSV File path
+RESULTS_STORE_PATH = 'results'  # Columnar results store root
+ALGORITHM_NAMES = ['FCFS', 'SJF', 'SJF-P', 'RR']  # Column order of simulate_instance results
+SEED = 0                  # Master seed for the per-instance random streams
+CACHE_PATH = 'using_simpy_cache.sqlite'  # Result cache (None disables caching)
+CACHE_FLUSH_INTERVAL = 100  # Instances between cache commits
+ENGINE = 'simpy'          # 'simpy' or 'engine' (event-heap core in engine.py, no coroutine per process)
+BATCHED_WORKLOAD = False  # Draw durations/arrivals in blocks (workload.ContinuousWorkload) instead of one at a time
+TRACE_LEVEL = 'off'       # Event tracing: 'off', 'info' (create/finish) or 'debug' (every dispatch)
+TRACE_PATH = 'trace.jsonl'  # Trace file ('.bin' for the binary format)
+TRACE_EVERY = 100         # Trace one instance out of every TRACE_EVERY
 
 
 # Process class representing a process in the system
@@ -24,12 +48,30 @@ class Process:
         self.env = env
         self.pid = pid
         self.duration = duration
+        self.arrival_time = env.now
         self.start_time = None
+        self.first_start_time = None  # First dispatch (start_time is overwritten on resume)
         self.end_time = None
         self.ready_time = 0  # Total time spent in ready state
         self.added_to_ready_queue = None  # Time when the process was added to the ready queue
         self.preempted = False
 
+    @property
+    def remaining_time(self):
+        # Policies order by remaining time; duration is decremented as the process runs
+        return self.duration
+
+
+# Environment that counts processed events (only used when profiling)
+class CountingEnvironment(simpy.Environment):
+    def __init__(self):
+        super().__init__()
+        self.events_processed = 0
+
+    def step(self):
+        self.events_processed += 1
+        super().step()
+
 
 # CPU class representing a processor
 class CPU:
@@ -40,10 +82,14 @@ class CPU:
 
 # Abstract base class for scheduling algorithms
 class Scheduler(ABC):
+    policy_name = None  # Name of the registered policy that orders the ready queue
+
     def __init__(self, env, cpu):
         self.env = env
         self.cpu = cpu
-        self.ready_queue = []
+        self.policy = create_policy(self.policy_name, QUANTUM)
+        self.sink = None  # Optional CompletionSink fed as processes finish
+        self.tracer = NULL_TRACER  # Event tracing (off by default)
 
     @abstractmethod
     def schedule(self):
@@ -51,113 +97,152 @@ class Scheduler(ABC):
 
     def add_process(self, process: Process):
         process.added_to_ready_queue = self.env.now  # Track when process enters the ready queue
-        print(f"Process {process.pid} created at {self.env.now} with duration {process.duration}")
-        self.ready_queue.append(process)
+        if self.tracer.level >= INFO:
+            self.tracer.emit(CREATED, self.env.now, process.pid, process.duration)
+        self.policy.on_arrival(process, self.env.now)
         self.schedule()
 
+    def mark_started(self, process: Process):
+        process.start_time = self.env.now
+        if process.first_start_time is None:
+            process.first_start_time = self.env.now
+
+    def finish_process(self, process: Process):
+        first_finish = process.end_time is None
+        process.end_time = self.env.now
+        if self.tracer.level >= INFO:
+            self.tracer.emit(FINISHED, self.env.now, process.pid)
+        if self.sink is not None and first_finish:
+            self.sink.add(process.ready_time, process.end_time - process.arrival_time,
+                          process.first_start_time - process.arrival_time)
+
 
 # First Come, First Served (FCFS) Scheduler
 class FCFSScheduler(Scheduler):
+    policy_name = 'FCFS'
+
     def schedule(self):
-        if self.ready_queue and self.cpu.processor.count < NUM_PROCESSORS:
-            process = self.ready_queue.pop(0)
+        if self.policy.has_ready() and self.cpu.processor.count < NUM_PROCESSORS:
+            process = self.policy.select_next(self.env.now)
             self.env.process(self.execute_process(process))
 
     def execute_process(self, process):
         with self.cpu.processor.request() as req:
             # yield req
-            process.start_time = self.env.now
-            print(f"Process {process.pid} started at {self.env.now}")
+            self.mark_started(process)
+            if self.tracer.level >= DEBUG:
+                self.tracer.emit(STARTED, self.env.now, process.pid)
             # Calculate how long the process was in the ready queue
             process.ready_time += self.env.now - process.added_to_ready_queue
             yield self.env.timeout(process.duration)
-            process.end_time = self.env.now
-            print(f"Process {process.pid} finished at {self.env.now}")
+            self.finish_process(process)
         self.schedule()
 
 
-# Shortest Job First (SJF) Scheduler
-class SJFScheduler(Scheduler):
-    def schedule(self):
-        if self.ready_queue and self.cpu.processor.count < NUM_PROCESSORS:
-            # Sort by shortest duration first
-            self.ready_queue.sort(key=lambda p: p.duration)
-            process = self.ready_queue.pop(0)
-            self.env.process(self.execute_process(process))
+# Shortest Job First (SJF) Scheduler: same dispatch, the policy orders by shortest duration
+class SJFScheduler(FCFSScheduler):
+    policy_name = 'SJF'
 
     def execute_process(self, process):
         with self.cpu.processor.request() as req:
             yield req
-            process.start_time = self.env.now
-            print(f"Process {process.pid} started at {self.env.now}")
+            self.mark_started(process)
+            if self.tracer.level >= DEBUG:
+                self.tracer.emit(STARTED, self.env.now, process.pid)
             # Calculate how long the process was in the ready queue
             process.ready_time += self.env.now - process.added_to_ready_queue
             yield self.env.timeout(process.duration)
-            process.end_time = self.env.now
-            print(f"Process {process.pid} finished at {self.env.now}")
+            self.finish_process(process)
         self.schedule()
 
 
-# Shortest Job First with Preemption (SJF-P) Scheduler
+# Shortest Job First with Preemption (SJF-P) Scheduler: preemptive SRTF, same decisions as engine.Engine
 class SJFPreemptiveScheduler(Scheduler):
+    policy_name = 'SJF-P'
+
     def __init__(self, env, cpu):
         super().__init__(env, cpu)
         self.current_processes = [None] * NUM_PROCESSORS  # Track current process on each CPU
+        self.runs = [None] * NUM_PROCESSORS  # simpy process executing on each CPU
+        self.run_start = [0] * NUM_PROCESSORS  # When the current run started on each CPU
+        self.tokens = [0] * NUM_PROCESSORS  # Invalidates heap entries of finished or preempted runs
+        self.idle = list(range(NUM_PROCESSORS))  # Heap of free CPUs
+        self.projected = []  # Heap of (-projected end, cpu, token): the run that ends last is on top
 
     def schedule(self):
-        if self.ready_queue:
-            # Sort by shortest duration first
-            self.ready_queue.sort(key=lambda p: p.duration)
-            for i in range(NUM_PROCESSORS):
-                if self.current_processes[i] is None:
-                    process = self.ready_queue.pop(0)
-                    self.current_processes[i] = process
-                    self.env.process(self.execute_process(process, i))
-                    return
-
-                # Preemption logic
-                next_process = self.ready_queue[0]
-                current_process = self.current_processes[i]
-                if next_process.duration < current_process.duration:
-                    self.current_processes[i] = next_process
-                    self.ready_queue.append(current_process)
-                    self.env.process(self.execute_process(next_process, i))
-                    return
-
-    def execute_process(self, process: Process, cpu_id: int):
-        with self.cpu.processor.request() as req:
+        # Fill free CPUs; with every CPU busy, a new arrival may preempt the run that ends last
+        if self.idle:
+            while self.idle and self.policy.has_ready():
+                self.start(heapq.heappop(self.idle), self.policy.select_next(self.env.now))
+        else:
+            self.check_preemption()
+
+    def start(self, cpu_id, process):
+        # Bookkeeping happens here, synchronously, so a preemption takes effect at once
+        process.ready_time += self.env.now - process.added_to_ready_queue
+        self.mark_started(process)
+        if self.tracer.level >= DEBUG:
+            self.tracer.emit(RESUMED if process.preempted else STARTED, self.env.now, process.pid)
+        self.current_processes[cpu_id] = process
+        self.run_start[cpu_id] = self.env.now
+        self.tokens[cpu_id] += 1
+        if len(self.projected) > 4 * NUM_PROCESSORS:
+            self.projected = [entry for entry in self.projected if self.is_current(entry[1], entry[2])]
+            heapq.heapify(self.projected)
+        heapq.heappush(self.projected, (-(self.env.now + process.duration), cpu_id, self.tokens[cpu_id]))
+        timer = self.env.timeout(process.duration)
+        self.runs[cpu_id] = self.env.process(self.execute_process(cpu_id, timer))
+
+    def is_current(self, cpu_id, token):
+        return token == self.tokens[cpu_id] and self.current_processes[cpu_id] is not None
+
+    def check_preemption(self):
+        projected = self.projected
+        while projected and not self.is_current(projected[0][1], projected[0][2]):
+            heapq.heappop(projected)
+        if not projected:
+            return
+        cpu_id = projected[0][1]
+        current_process = self.current_processes[cpu_id]
+        remaining = current_process.duration - (self.env.now - self.run_start[cpu_id])
+        if self.policy.should_preempt(remaining):
+            heapq.heappop(projected)
+            current_process.duration = remaining
+            current_process.added_to_ready_queue = self.env.now
+            current_process.preempted = True
+            if self.tracer.level >= DEBUG:
+                self.tracer.emit(PREEMPTED, self.env.now, current_process.pid)
+            self.policy.on_preempt(current_process, self.env.now)
+            self.runs[cpu_id].interrupt()
+            self.start(cpu_id, self.policy.select_next(self.env.now))
+
+    def execute_process(self, cpu_id, timer):
+        with self.cpu.processor.request():
             try:
-                yield req
-                process.start_time = self.env.now
-                if process.preempted:
-                    print(f"Process {process.pid} resumed at {self.env.now}")
-                else:
-                    print(f"Process {process.pid} started at {self.env.now}")
-                # Calculate how long the process was in the ready queue
-                process.ready_time += self.env.now - process.added_to_ready_queue
-                yield self.env.timeout(process.duration)
-                process.end_time = self.env.now
-                print(f"Process {process.pid} finished at {self.env.now}")
-                self.current_processes[cpu_id] = None
-            except simpy.Interrupt as interrupt:
-                process.added_to_ready_queue = self.env.now
-                process.preempted = True
-                print(f"Process {process.pid} preempted at {self.env.now}")
-                self.ready_queue.append(process)
-                self.current_processes[cpu_id] = None
+                yield timer
+            except simpy.Interrupt:
+                return  # Preempted: check_preemption already requeued the process
+        process = self.current_processes[cpu_id]
+        self.current_processes[cpu_id] = None
+        self.runs[cpu_id] = None
+        process.duration = 0
+        self.finish_process(process)
+        heapq.heappush(self.idle, cpu_id)
         self.schedule()
 
 
 # Round Robin (RR) Scheduler
 class RRScheduler(Scheduler):
+    policy_name = 'RR'
+
     def __init__(self, env, cpu):
         super().__init__(env, cpu)
         self.currently_running = 0  # Track the number of processes currently running
 
     def schedule(self):
         # Continuously schedule if there's space in CPU and ready queue isn't empty
-        while self.ready_queue and self.currently_running < NUM_PROCESSORS:
-            process = self.ready_queue.pop(0)
+        while self.policy.has_ready() and self.currently_running < NUM_PROCESSORS:
+            process = self.policy.select_next(self.env.now)
             self.env.process(self.execute_process(process))
 
     def execute_process(self, process: Process):
@@ -165,15 +250,13 @@ class RRScheduler(Scheduler):
             yield req
             self.currently_running += 1
 
-            process.start_time = self.env.now
-            if process.preempted:
-                print(f"Process {process.pid} resumed at {self.env.now}")
-            else:
-                print(f"Process {process.pid} started at {self.env.now}")
+            self.mark_started(process)
+            if self.tracer.level >= DEBUG:
+                self.tracer.emit(RESUMED if process.preempted else STARTED, self.env.now, process.pid)
 
             # Calculate how long the process was in the ready queue
             process.ready_time += self.env.now - process.added_to_ready_queue
-            execution_time = min(QUANTUM, process.duration)
+            execution_time = min(self.policy.time_slice(process), process.duration)
             yield self.env.timeout(execution_time)
             process.duration -= execution_time
 
@@ -181,30 +264,51 @@ class RRScheduler(Scheduler):
                 # Process not finished, re-enter ready queue
                 process.added_to_ready_queue = self.env.now  # Update when it goes back to the queue
                 process.preempted = True
-                print(f"Process {process.pid} preempted at {self.env.now}")
-                self.ready_queue.append(process)
+                if self.tracer.level >= DEBUG:
+                    self.tracer.emit(PREEMPTED, self.env.now, process.pid)
+                self.policy.on_preempt(process, self.env.now)
             else:
-                process.end_time = self.env.now
-                print(f"Process {process.pid} finished at {self.env.now}")
+                self.finish_process(process)
 
             self.currently_running -= 1
         self.schedule()
 
 
+SCHEDULER_CLASSES = dict(zip(ALGORITHM_NAMES, [FCFSScheduler, SJFScheduler, SJFPreemptiveScheduler, RRScheduler]))
+
+
 # List to store completed processes
 completed_processes = []
 
 
 # Process Generator
-def process_generator(env, scheduler, arrival_rate):
+def process_generator(env, scheduler, arrival_rate, retain=True, workload=None):
     pid = 0
     while MAX_PROCESSES is None or pid < MAX_PROCESSES:
-        duration = max(0, np.random.normal(MEAN_DURATION, STD_DURATION))  # Process execution time
+        if workload is None:
+            duration = max(0, np.random.normal(MEAN_DURATION, STD_DURATION))  # Process execution time
+        else:
+            duration = workload.next_duration()
         process = Process(env, pid, duration)
         scheduler.add_process(process)
-        completed_processes.append(process)  # Track completed processes
+        if retain:
+            completed_processes.append(process)  # Track completed processes
         pid += 1
-        yield env.timeout(random.expovariate(1 / arrival_rate))
+        if workload is None:
+            yield env.timeout(random.expovariate(1 / arrival_rate))
+        else:
+            yield env.timeout(workload.next_interarrival())
+
+
+def process_generator_trace(env, scheduler, path, retain=True):
+    # Replays (arrival, duration) records from a job trace (CSV or binary), streamed in chunks
+    for pid, (arrival, duration, priority) in enumerate(iter_jobs(path)):
+        if arrival > env.now:
+            yield env.timeout(arrival - env.now)
+        process = Process(env, pid, duration)
+        scheduler.add_process(process)
+        if retain:
+            completed_processes.append(process)
 
 
 def process_generator_validation(env, scheduler):
@@ -230,15 +334,23 @@ def process_generator_validation(env, scheduler):
 
 
 # Simulation Setup
-def simulate(scheduler_class, arrival_rate=ARRIVAL_RATE, sim_time=SIM_TIME):
+def simulate(scheduler_class, arrival_rate=ARRIVAL_RATE, sim_time=SIM_TIME, sink=None, tracer=NULL_TRACER,
+             workload=None):
     global completed_processes
     completed_processes = []  # Reset for each simulation
     env = simpy.Environment()
     cpu = CPU(env)
     scheduler = scheduler_class(env, cpu)
-    env.process(process_generator(env, scheduler, arrival_rate))
+    scheduler.sink = sink
+    scheduler.tracer = tracer
+    # With a sink, finished processes are streamed into it and nothing is retained
+    env.process(process_generator(env, scheduler, arrival_rate, retain=sink is None, workload=workload))
     env.run(until=sim_time)
 
+    if sink is not None:
+        print(f"Average Ready Time: {sink.metrics['wait'].stats.mean:.2f} units")
+        return
+
     # Calculate average ready time
     total_ready_time = sum(p.ready_time for p in completed_processes if p.end_time)
     average_ready_time = total_ready_time / len(completed_processes)
@@ -250,8 +362,12 @@ def simulate_validation(scheduler_class, sim_time=SIM_TIME):
     env = simpy.Environment()
     cpu = CPU(env)
     scheduler = scheduler_class(env, cpu)
+    # Every event is printed to stdout so the schedule can be checked by hand
+    writer = TraceWriter(None, 'text')
+    scheduler.tracer = Tracer(writer, DEBUG)
     env.process(process_generator_validation(env, scheduler))
     env.run(until=sim_time)
+    writer.close()
 
     # Calculate average ready time
     total_ready_time = sum(p.ready_time for p in completed_processes if p.end_time)
@@ -259,6 +375,78 @@ def simulate_validation(scheduler_class, sim_time=SIM_TIME):
     print(f"Average Ready Time: {average_ready_time:.2f} units")
 
 
+# Event-heap path: same random draws as process_generator, without simpy
+def engine_arrivals(arrival_rate, workload=None):
+    # Arrival instants; the next interval is drawn only after the current job is created
+    pid = 0
+    now = 0
+    while MAX_PROCESSES is None or pid < MAX_PROCESSES:
+        yield now
+        pid += 1
+        now += random.expovariate(1 / arrival_rate) if workload is None else workload.next_interarrival()
+
+
+def create_engine_job(pid, now):
+    duration = max(0, np.random.normal(MEAN_DURATION, STD_DURATION))  # Process execution time
+    return Job(pid, now, duration)
+
+
+def simulate_engine(algorithm, arrival_rate=ARRIVAL_RATE, sim_time=SIM_TIME, sink=None, tracer=NULL_TRACER,
+                    workload=None):
+    # Runs one algorithm on engine.Engine. FCFS, SJF and RR match the simpy schedulers
+    # exactly for the same seed (or workload); SJF-P (preemptive SRTF) matches it too.
+    engine = Engine(NUM_PROCESSORS, create_policy(algorithm, QUANTUM), sink=sink, retain=sink is None,
+                    tracer=tracer)
+    if workload is None:
+        create_job = create_engine_job
+    else:
+        create_job = lambda pid, now: Job(pid, now, workload.next_duration())
+    engine.run(sim_time, engine_arrivals(arrival_rate, workload), create_job)
+    return engine
+
+
+def trace_arrivals(path, jobs):
+    # Arrival instants of a job trace; each record's job is queued for create_job.
+    # Times advance as in process_generator_trace (now + (arrival - now)) so both paths agree exactly
+    now = 0
+    for arrival, duration, priority in iter_jobs(path):
+        if arrival > now:
+            now += arrival - now
+        jobs.append((duration, priority))
+        yield now
+
+
+def simulate_trace(algorithm, path, sim_time=None, engine=ENGINE, tracer=NULL_TRACER):
+    # Average ready time of one algorithm over a job trace (sim_time=None runs until the trace drains)
+    if engine == 'engine':
+        jobs = deque()
+        run = Engine(NUM_PROCESSORS, create_policy(algorithm, QUANTUM), tracer=tracer)
+        run.run(math.inf if sim_time is None else sim_time, trace_arrivals(path, jobs),
+                lambda pid, now: Job(pid, now, *jobs.popleft()))
+        return run.average_ready_time()
+
+    global completed_processes
+    completed_processes = []
+    env = simpy.Environment()
+    scheduler = SCHEDULER_CLASSES[algorithm](env, CPU(env))
+    scheduler.tracer = tracer
+    env.process(process_generator_trace(env, scheduler, path))
+    env.run(until=sim_time)
+    completed = [p for p in completed_processes if p.end_time is not None]
+    return sum(p.ready_time for p in completed) / len(completed) if completed else 0
+
+
+def instance_workload(workload_seed):
+    # A fresh ContinuousWorkload per algorithm: the same seed gives every algorithm the same jobs
+    if workload_seed is None:
+        return None
+    return ContinuousWorkload(ARRIVAL_RATE, MEAN_DURATION, STD_DURATION, workload_seed)
+
+
+def instance_workload_seed(instance_num):
+    return np.random.SeedSequence(SEED, spawn_key=(instance_num,)) if BATCHED_WORKLOAD else None
+
+
 def run_one_simulation_instance():
     # Run the simulations with different schedulers
     print("First Come, First Served (FCFS) Simulation:")
@@ -275,17 +463,25 @@ def run_one_simulation_instance():
 
 
 # Function to simulate all schedulers in one instance
-def simulate_instance(instance_num):
+def simulate_instance(instance_num, engine=ENGINE, tracer=NULL_TRACER, workload_seed=None):
+    # Seeded here so every path (CSV, results store, cache) gives the same rows for an instance
+    seed_replication(SEED, instance_num)
+    if engine == 'engine':
+        return [instance_num] + [simulate_engine(name, tracer=tracer.for_algorithm(index),
+                                                 workload=instance_workload(workload_seed)).average_ready_time()
+                                 for index, name in enumerate(ALGORITHM_NAMES)]
+
     results = [instance_num]  # Start with instance number
 
     # Simulate each scheduler and append its average ready time
-    for scheduler_class in [FCFSScheduler, SJFScheduler, SJFPreemptiveScheduler, RRScheduler]:
+    for index, scheduler_class in enumerate([FCFSScheduler, SJFScheduler, SJFPreemptiveScheduler, RRScheduler]):
         global completed_processes
         completed_processes = []  # Reset for each simulation
         env = simpy.Environment()
         cpu = CPU(env)
         scheduler = scheduler_class(env, cpu)
-        env.process(process_generator(env, scheduler, ARRIVAL_RATE))
+        scheduler.tracer = tracer.for_algorithm(index)  # Algorithm index follows ALGORITHM_NAMES
+        env.process(process_generator(env, scheduler, ARRIVAL_RATE, workload=instance_workload(workload_seed)))
         env.run(until=SIM_TIME)
 
         # Calculate average ready time
@@ -297,8 +493,65 @@ def simulate_instance(instance_num):
     return results
 
 
+def open_tracer():
+    # Tracer shared by a batch of instances, per TRACE_LEVEL/TRACE_PATH/TRACE_EVERY
+    level = LEVELS[TRACE_LEVEL]
+    if level == OFF:
+        return NULL_TRACER
+    writer = TraceWriter(TRACE_PATH, 'binary' if TRACE_PATH.endswith('.bin') else 'jsonl')
+    return Tracer(writer, level, sample_every=TRACE_EVERY)
+
+
+def close_tracer(tracer):
+    if tracer.writer is not None:
+        tracer.writer.close()
+
+
+def run_profiled(algorithm, scheduler_class, engine, profile):
+    # One profiled run; its objects are released on return, before the next run starts
+    global completed_processes
+    completed_processes = []
+    profile.start()
+    if engine == 'engine':
+        run = Engine(NUM_PROCESSORS, create_policy(algorithm, QUANTUM))
+        profile.instrument(run, 'dispatch', lambda: len(run.policy.queue))
+        run.run(SIM_TIME, engine_arrivals(ARRIVAL_RATE), create_engine_job)
+        profile.events = run.events_processed()
+    else:
+        env = CountingEnvironment()
+        scheduler = scheduler_class(env, CPU(env))
+        profile.instrument(scheduler, 'schedule', lambda: len(scheduler.policy.queue))
+        env.process(process_generator(env, scheduler, ARRIVAL_RATE))
+        env.run(until=SIM_TIME)
+        profile.events = env.events_processed
+    profile.stop()
+
+
+def profile_instance(instance_num, engine=ENGINE):
+    # Same runs as simulate_instance, with one RunProfile per algorithm (scheduling calls are timed)
+    profiles = []
+    for name, scheduler_class in SCHEDULER_CLASSES.items():
+        profile = RunProfile(f"{name} #{instance_num}")
+        run_profiled(name, scheduler_class, engine, profile)
+        profiles.append(profile.summary())
+    return profiles
+
+
+def profile_instances(num_instances=NUM_INSTANCES, engine=ENGINE):
+    # Per-algorithm and overall profile reports for a batch of seeded instances
+    profiles = []
+    for i in range(num_instances):
+        seed_replication(SEED, i)
+        profiles.append(profile_instance(i, engine))
+    reports = [aggregate([row[k] for row in profiles], name) for k, name in enumerate(ALGORITHM_NAMES)]
+    for report in reports:
+        print(format_report(report))
+    print(format_report(aggregate(reports, engine)))
+
+
 def generate_csv_file():
     # Run all instances and write to CSV
+    tracer = open_tracer()
     with open(CSV_FILE_PATH, mode='w', newline='') as file:
         writer = csv.writer(file)
         # Write header
@@ -306,22 +559,75 @@ def generate_csv_file():
 
         # Simulate and write each instance result
         for i in range(NUM_INSTANCES):
-            row = simulate_instance(i)
+            row = simulate_instance(i, tracer=tracer.for_instance(i), workload_seed=instance_workload_seed(i))
             writer.writerow(row)
+    close_tracer(tracer)
 
     print(f"Simulation results saved to {CSV_FILE_PATH}")
 
 
+def simulation_config():
+    # Constants that determine the result of an instance
+    return {
+        'num_processors': NUM_PROCESSORS,
+        'quantum': QUANTUM,
+        'mean_duration': MEAN_DURATION,
+        'std_duration': STD_DURATION,
+        'arrival_rate': ARRIVAL_RATE,
+        'sim_time': SIM_TIME,
+        'max_processes': MAX_PROCESSES,
+        'engine': ENGINE,
+        'batched_workload': BATCHED_WORKLOAD,
+    }
+
+
+def simulate_instance_cached(instance_num, cache, tracer=NULL_TRACER):
+    # Seeded instance, reused from the cache when the constants and code have not changed
+    # (cached instances are not re-run, so they produce no trace)
+    key = cache.key(simulation_config(), implementation_version(local_dependencies('using_simpy')), SEED, instance_num)
+    row = cache.get(key)
+    if row is None:
+        row = simulate_instance(instance_num, tracer=tracer, workload_seed=instance_workload_seed(instance_num))
+        cache.put(key, row)
+    return row
+
+
+def generate_results_store(root=RESULTS_STORE_PATH):
+    # Run all instances and append them to the columnar store, one partition per algorithm
+    store = ResultsStore(root)
+    cache = ResultCache(CACHE_PATH) if CACHE_PATH else None
+    tracer = open_tracer()
+    writers = [store.writer(algorithm=name, num_processors=NUM_PROCESSORS, arrival_rate=ARRIVAL_RATE)
+               for name in ALGORITHM_NAMES]
+    for i in range(NUM_INSTANCES):
+        instance_tracer = tracer.for_instance(i)
+        if cache is None:
+            row = simulate_instance(i, tracer=instance_tracer, workload_seed=instance_workload_seed(i))
+        else:
+            row = simulate_instance_cached(i, cache, instance_tracer)
+            if (i + 1) % CACHE_FLUSH_INTERVAL == 0:
+                cache.flush()  # A run that is killed keeps the instances already finished
+        for writer, average_ready_time in zip(writers, row[1:]):
+            writer.add_row(instance=row[0], average_ready_time=average_ready_time)
+    for writer in writers:
+        writer.flush()
+    if cache is not None:
+        cache.close()
+    close_tracer(tracer)
+
+    print(f"Simulation results saved to {root}")
+
+
 def validate():
     print("First Come, First Served (FCFS) Simulation:")
     simulate_validation(FCFSScheduler)
     print("\nShortest Job First (SJF) Simulation:")
     simulate_validation(SJFScheduler)
-    # print("\nShortest Job First with Preemption (SJF-P) Simulation:")
-    # simulate(SJFPreemptiveScheduler)
+    print("\nShortest Job First with Preemption (SJF-P) Simulation:")
+    simulate_validation(SJFPreemptiveScheduler)
     print("\nRound Robin (RR) Simulation:")
     simulate_validation(RRScheduler)
 
 
 if __name__ == '__main__':
-    generate_csv_file()
\ No newline at end of file
+    generate_results_store()
\ No newline at end of file
@@ -0,0 +1,239 @@
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Processor import Processor
+from Process import Process
+from Scheduler import Scheduler
+from Simulation import DEFAULT_DURATION_RANGE
+
+NOT_SET = -1  # Marca de início/término inexistente (None nos objetos Process)
+# Chave de ordenação de cada política suportada (None: ordem de chegada)
+KEYS = {'fifo': None, 'FCFS': None, 'sjf': 'durations', 'SJF': 'durations', 'priority': 'priorities'}
+UNSUPPORTED = ('warmup', 'trace', 'run_queues', 'workload', 'profile')
+CHUNK_BYTES = 256 * 1024 * 1024  # Memória aproximada de um bloco de replicações em simulate_batch
+BYTES_PER_JOB = 128  # Cerca de 16 vetores int64 (R, n) vivos ao mesmo tempo
+
+
+def generate_workloads(num_replications: int, total_time: int, arrival_rate: float,
+                       rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gera cargas no mesmo modelo de Simulation, como vetores planos.
+
+    Retorna (arrivals, durations, priorities), cada um com forma
+    (num_replications, n_max). Cada linha está em ordem de pid; as posições
+    de preenchimento têm chegada em total_time e nunca são despachadas.
+    """
+    counts = rng.binomial(n=10, p=arrival_rate, size=(num_replications, total_time))
+    per_row = counts.sum(axis=1)
+    n_max = int(per_row.max()) if num_replications else 0
+    arrivals = np.full((num_replications, n_max), total_time, dtype=np.int64)
+    ticks = np.repeat(np.tile(np.arange(total_time), num_replications), counts.ravel())
+    rows = np.repeat(np.arange(num_replications), per_row)
+    offsets = np.concatenate(([0], np.cumsum(per_row)[:-1]))
+    columns = np.arange(len(ticks)) - np.repeat(offsets, per_row)
+    arrivals[rows, columns] = ticks
+    durations = rng.integers(1, 11, size=(num_replications, n_max))
+    priorities = rng.integers(1, 6, size=(num_replications, n_max))
+    return arrivals, durations, priorities
+
+
+def replication_workloads(indices: Sequence[int], master_seed: int, total_time: int, arrival_rate: float,
+                          duration_range: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Como generate_workloads, mas cada linha vem do próprio gerador da replicação.
+
+    O gerador da linha de `index` é semeado com SeedSequence(master_seed,
+    spawn_key=(index,)), então a carga não depende do bloco em que a
+    replicação é simulada nem do número de workers.
+    """
+    low, high = duration_range
+    rows = []
+    for index in indices:
+        rng = np.random.default_rng(np.random.SeedSequence(master_seed, spawn_key=(index,)))
+        arrivals = np.repeat(np.arange(total_time), rng.binomial(n=10, p=arrival_rate, size=total_time))
+        rows.append((arrivals, rng.integers(low, high + 1, size=len(arrivals)), rng.integers(1, 6, size=len(arrivals))))
+    n_max = max((len(row[0]) for row in rows), default=0)
+    # Preenchimento: chegada em total_time (nunca despachado), duração e prioridade 1
+    arrivals = np.full((len(rows), n_max), total_time, dtype=np.int64)
+    durations = np.ones((len(rows), n_max), dtype=np.int64)
+    priorities = np.ones((len(rows), n_max), dtype=np.int64)
+    for r, (row_arrivals, row_durations, row_priorities) in enumerate(rows):
+        arrivals[r, :len(row_arrivals)] = row_arrivals
+        durations[r, :len(row_durations)] = row_durations
+        priorities[r, :len(row_priorities)] = row_priorities
+    return arrivals, durations, priorities
+
+
+def check_config(config: dict) -> None:
+    if config['scheduling_algorithm'] not in KEYS:
+        raise ValueError(f"O motor vetorizado não suporta o algoritmo {config['scheduling_algorithm']}")
+    unsupported = [key for key in UNSUPPORTED if config.get(key)]
+    if unsupported:
+        raise ValueError(f"O motor vetorizado não suporta: {', '.join(unsupported)}")
+
+
+def chunk_size(config: dict) -> int:
+    # Replicações por bloco, para que os vetores (R, n) caibam em CHUNK_BYTES
+    expected_jobs = 10 * config['arrival_rate'] * config['total_simulation_time']
+    return max(1, int(CHUNK_BYTES // (BYTES_PER_JOB * max(expected_jobs, 1))))
+
+
+def idle_times(config: dict, master_seed: int, indices: Sequence[int]) -> List[float]:
+    """Tempo ocioso médio das replicações `indices`, simuladas juntas em blocos.
+
+    Mesmo modelo de Simulation (e resultado de Scheduler para a mesma
+    carga), mas com a carga de replication_workloads: os valores diferem
+    dos motores 'tick' e 'events' para a mesma semente.
+    """
+    check_config(config)
+    total_time = config['total_simulation_time']
+    size = chunk_size(config)
+    results = []
+    for start in range(0, len(indices), size):
+        arrivals, durations, priorities = replication_workloads(
+            indices[start:start + size], master_seed, total_time, config['arrival_rate'],
+            config.get('duration_range', DEFAULT_DURATION_RANGE))
+        keys = {None: None, 'durations': durations, 'priorities': priorities}[KEYS[config['scheduling_algorithm']]]
+        _, _, idle = simulate_batch(arrivals, durations, config['num_processors'], total_time, keys)
+        results.extend(idle.mean(axis=1).tolist())
+    return results
+
+
+def simulate_batch(arrivals: np.ndarray, durations: np.ndarray, num_processors: int,
+                   total_time: int, keys: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simula várias replicações não preemptivas de uma vez.
+
+    Reproduz Scheduler.schedule_fifo (keys=None), schedule_sjf
+    (keys=durations) e schedule_priority (keys=priorities) no modelo de ticks
+    de Simulation. O laço percorre os despachos; cada passo opera sobre todas
+    as replicações em conjunto. Os processos de cada linha são agrupados por
+    chave, e dentro de cada grupo ficam em ordem de pid, de modo que o próximo
+    processo é a primeira cabeça de grupo que já chegou.
+
+    Retorna (start, finish, idle): start e finish com forma (R, n), usando
+    NOT_SET para processos não iniciados/terminados, e idle com forma (R, P).
+    """
+    num_replications, n = arrivals.shape
+    if keys is None and num_processors == 1:
+        return simulate_fifo_single(arrivals, durations, total_time)
+    if keys is None:
+        keys = np.zeros_like(arrivals)
+    order = np.argsort(keys, axis=1, kind='stable')
+    sorted_keys = np.take_along_axis(keys, order, axis=1)
+    sorted_arrivals = np.take_along_axis(arrivals, order, axis=1)
+    sorted_durations = np.take_along_axis(durations, order, axis=1)
+
+    # Limites de cada grupo de chave, por replicação
+    key_values = np.unique(keys) if n else np.zeros(1, dtype=keys.dtype)
+    bucket_end = np.stack([(sorted_keys <= value).sum(axis=1) for value in key_values], axis=1)
+    bucket_ptr = np.concatenate((np.zeros((num_replications, 1), dtype=bucket_end.dtype), bucket_end[:, :-1]), axis=1)
+
+    start = np.full((num_replications, n), NOT_SET, dtype=np.int64)
+    free = np.zeros((num_replications, num_processors), dtype=np.int64)  # Próximo tick livre
+    last = np.zeros((num_replications, num_processors), dtype=np.int64)  # Última atualização de ociosidade
+    idle = np.zeros((num_replications, num_processors), dtype=np.int64)
+    active = np.arange(num_replications)
+
+    for _ in range(n):
+        ptr = bucket_ptr[active]
+        has_job = ptr < bucket_end[active]
+        head_arrival = np.where(has_job, sorted_arrivals[active[:, None], np.minimum(ptr, n - 1)], total_time)
+        proc_free = free[active]
+        tick = np.maximum(proc_free.min(axis=1), head_arrival.min(axis=1))
+        running = tick < total_time
+        if not running.all():
+            active, ptr, head_arrival, proc_free, tick = active[running], ptr[running], head_arrival[running], proc_free[running], tick[running]
+            if not len(active):
+                break
+        bucket = (head_arrival <= tick[:, None]).argmax(axis=1)
+        position = ptr[np.arange(len(active)), bucket]
+        processor = (proc_free <= tick[:, None]).argmax(axis=1)
+        duration = sorted_durations[active, position]
+
+        start[active, order[active, position]] = tick
+        idle[active, processor] += tick - last[active, processor]
+        last[active, processor] = tick + duration - 1
+        free[active, processor] = tick + duration
+        bucket_ptr[active, bucket] += 1
+
+    if total_time > 0:
+        idle += np.maximum(0, total_time - 1 - last)
+    finish = start + durations - 1
+    finish = np.where((start != NOT_SET) & (finish < total_time), finish, NOT_SET)
+    return start, finish, idle
+
+
+def simulate_fifo_single(arrivals: np.ndarray, durations: np.ndarray,
+                         total_time: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """FIFO com um processador em forma fechada, sem laço sobre os processos.
+
+    Com C_i = soma das durações anteriores a i, o início é
+    s_i = C_i + max_{j<=i}(a_j - C_j), calculado com acumulados por linha.
+    """
+    num_replications, n = arrivals.shape
+    before = np.cumsum(durations, axis=1) - durations
+    start = before + np.maximum.accumulate(arrivals - before, axis=1)
+    started = start < total_time
+    finish = start + durations - 1
+    # Tick da última liberação antes de cada processo (0 antes do primeiro)
+    previous = np.concatenate((np.zeros((num_replications, 1), dtype=finish.dtype), finish[:, :-1]), axis=1)
+    idle = np.where(started, start - previous, 0).sum(axis=1)
+    count = started.sum(axis=1)
+    last = np.zeros(num_replications, dtype=finish.dtype)
+    if n:
+        last = np.where(count > 0, finish[np.arange(num_replications), np.maximum(count - 1, 0)], 0)
+    if total_time > 0:
+        idle += np.maximum(0, total_time - 1 - last)
+    finish = np.where(started & (finish < total_time), finish, NOT_SET)
+    start = np.where(started, start, NOT_SET)
+    return start, finish, idle[:, None]
+
+
+def simulate_objects(arrivals: np.ndarray, durations: np.ndarray, priorities: np.ndarray,
+                     num_processors: int, scheduling_algorithm: str, total_time: int) -> Tuple[list, list]:
+    # Referência: roda uma replicação com Process/Processor/Scheduler, tick a tick
+    processors = [Processor(i) for i in range(num_processors)]
+    scheduler = Scheduler(processors, scheduling_algorithm)
+    processes = [Process(pid, int(a), int(d), int(p)) for pid, (a, d, p) in enumerate(zip(arrivals, durations, priorities))]
+    next_pid = 0
+    for current_time in range(total_time):
+        while next_pid < len(processes) and processes[next_pid].arrival_time == current_time:
+            scheduler.add_process(processes[next_pid])
+            next_pid += 1
+        scheduler.schedule(current_time)
+        for processor in processors:
+            processor.update_idle_time(current_time)
+            if processor.current_process:
+                processor.current_process.remaining_time -= 1
+                if processor.current_process.is_finished():
+                    scheduler.release(processor, current_time)
+    return processes, processors
+
+
+def validate(num_replications: int = 20, total_time: int = 200, seed: int = 0) -> bool:
+    # Compara o motor vetorizado com o Scheduler baseado em objetos
+    rng = np.random.default_rng(seed)
+    ok = True
+    for scheduling_algorithm in ['fifo', 'sjf', 'priority']:
+        for num_processors in [1, 4, 9]:
+            for arrival_rate in [0.05, 0.3, 0.7]:
+                arrivals, durations, priorities = generate_workloads(num_replications, total_time, arrival_rate, rng)
+                keys = {'fifo': None, 'sjf': durations, 'priority': priorities}[scheduling_algorithm]
+                start, finish, idle = simulate_batch(arrivals, durations, num_processors, total_time, keys)
+                for r in range(num_replications):
+                    n = int((arrivals[r] < total_time).sum())
+                    processes, processors = simulate_objects(arrivals[r, :n], durations[r, :n], priorities[r, :n],
+                                                             num_processors, scheduling_algorithm, total_time)
+                    expected_start = [NOT_SET if p.start_time is None else p.start_time for p in processes]
+                    expected_finish = [NOT_SET if p.finish_time is None else p.finish_time for p in processes]
+                    if (expected_start != start[r, :n].tolist() or expected_finish != finish[r, :n].tolist()
+                            or [p.idle_time for p in processors] != idle[r].tolist()):
+                        print(f"Divergência: {scheduling_algorithm}, {num_processors} processadores, taxa {arrival_rate}, replicação {r}")
+                        ok = False
+    return ok
+
+
+if __name__ == '__main__':
+    ok = validate()
+    print("Validação:", "ok" if ok else "falhou")
+    sys.exit(0 if ok else 1)
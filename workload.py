@@ -0,0 +1,176 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from Simulation import DEFAULT_DURATION_RANGE
+
+WORKLOAD_BLOCK = 65536  # Valores sorteados por bloco em cada fluxo
+
+
+class Workload(ABC):
+    """Carga de trabalho sorteada em blocos e entregue valor a valor.
+
+    Cada fluxo (chegadas, durações...) tem o seu próprio numpy Generator,
+    derivado da semente por SeedSequence.spawn, e é sorteado em blocos de
+    `block` valores. Como os fluxos são independentes, os valores entregues
+    não dependem da ordem em que os fluxos são consumidos. Só o estado do
+    gerador no início do último bloco é guardado (para a retomada); com
+    record=True os blocos sorteados também ficam guardados, e save() os grava
+    para que load_workload() reproduza a mesma carga sem sortear nada.
+    """
+
+    kind = ''
+    streams: tuple = ()
+    cursors: tuple = ()  # Atributos ligados aos fluxos (geradores): recriados por open_streams
+
+    def __init__(self, seed=None, block: int = WORKLOAD_BLOCK, record: bool = False) -> None:
+        self.seed = seed
+        self.block = block
+        self.record = record
+        sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.rngs = dict(zip(self.streams, (np.random.default_rng(s) for s in sequence.spawn(len(self.streams)))))
+        self.blocks: Dict[str, List[np.ndarray]] = {name: [] for name in self.streams}
+        self.drawn = dict.fromkeys(self.streams, 0)  # Valores já sorteados em cada fluxo
+        self.block_start = dict.fromkeys(self.streams, 0)  # Índice do primeiro valor do último bloco
+        self.block_state: Dict[str, dict] = {}  # Estado do gerador antes do último bloco
+        self.replay: Optional[Dict[str, np.ndarray]] = None  # Valores gravados (modo replay)
+
+    @abstractmethod
+    def sample(self, name: str, size: int) -> np.ndarray:
+        """Sorteia `size` valores do fluxo `name`."""
+
+    @abstractmethod
+    def open_streams(self, consumed: Optional[Dict[str, int]] = None) -> None:
+        """(Re)cria os cursores dos fluxos, continuando após `consumed` valores de cada um."""
+
+    def params(self) -> dict:
+        # Parâmetros do construtor, gravados junto com os blocos
+        return {}
+
+    def draw(self, name: str) -> list:
+        start = self.drawn[name]
+        if self.replay is not None:
+            values = self.replay[name][start:start + self.block]
+            if not len(values):
+                raise ValueError(f"Workload gravado esgotado no fluxo '{name}'")
+        else:
+            self.block_state[name] = self.rngs[name].bit_generator.state
+            values = self.sample(name, self.block)
+        self.block_start[name] = start
+        self.drawn[name] = start + len(values)
+        if self.record:
+            self.blocks[name].append(values)
+        return values.tolist()
+
+    def rewind(self, name: str) -> None:
+        # Volta ao início do último bloco: sorteá-lo de novo dá os mesmos valores
+        self.drawn[name] = self.block_start[name]
+        if self.replay is None:
+            self.rngs[name].bit_generator.state = self.block_state[name]
+        if self.record:
+            self.blocks[name].pop()
+
+    def stream(self, name: str, consumed: int = 0) -> Iterator:
+        # Com consumed (retomada), refaz o último bloco e entrega o que sobrou dele
+        if not self.block_start[name] <= consumed <= self.drawn[name]:
+            raise ValueError(f"Não é possível retomar o fluxo '{name}' no valor {consumed}")
+        if consumed < self.drawn[name]:
+            start = self.block_start[name]
+            self.rewind(name)
+            yield from self.draw(name)[consumed - start:]
+        while True:
+            yield from self.draw(name)
+
+    def __getstate__(self) -> dict:
+        # Geradores não são serializáveis; quem restaura chama open_streams com o consumo de cada fluxo
+        return {name: value for name, value in self.__dict__.items() if name not in self.cursors}
+
+    def save(self, path: str) -> None:
+        if not self.record:
+            raise ValueError("save() precisa de um Workload criado com record=True")
+        arrays = {name: np.concatenate(blocks) if blocks else np.zeros(0) for name, blocks in self.blocks.items()}
+        np.savez(path, params=json.dumps(dict(self.params(), kind=self.kind)), **arrays)
+
+
+class TickWorkload(Workload):
+    """Carga do laço de ticks: chegadas por tick, duração e prioridade de cada processo."""
+
+    kind = 'tick'
+    streams = ('arrivals', 'duration', 'priority')
+    cursors = ('arrivals', 'next_arrivals', 'next_job')
+
+    def __init__(self, arrival_rate: float, duration_range: tuple = DEFAULT_DURATION_RANGE,
+                 seed=None, block: int = WORKLOAD_BLOCK, record: bool = False) -> None:
+        self.arrival_rate = arrival_rate
+        self.duration_range = tuple(duration_range)
+        super().__init__(seed, block, record)
+        self.open_streams()
+
+    def open_streams(self, consumed: Optional[Dict[str, int]] = None) -> None:
+        consumed = consumed or {}
+        self.arrivals = self.stream('arrivals', consumed.get('arrivals', 0))
+        self.next_arrivals = self.arrivals.__next__
+        self.next_job = zip(self.stream('duration', consumed.get('duration', 0)),
+                            self.stream('priority', consumed.get('priority', 0))).__next__
+
+    def sample(self, name: str, size: int) -> np.ndarray:
+        rng = self.rngs[name]
+        if name == 'arrivals':
+            return rng.binomial(10, self.arrival_rate, size=size)
+        if name == 'duration':
+            return rng.integers(self.duration_range[0], self.duration_range[1], size=size, endpoint=True)
+        return rng.integers(1, 5, size=size, endpoint=True)
+
+    def take_arrivals(self, size: int) -> np.ndarray:
+        # Chegadas dos próximos `size` ticks (o mesmo fluxo de next_arrivals)
+        return np.fromiter(self.arrivals, dtype=np.int64, count=size)
+
+    def params(self) -> dict:
+        return {'arrival_rate': self.arrival_rate, 'duration_range': list(self.duration_range)}
+
+
+class ContinuousWorkload(Workload):
+    """Carga em tempo contínuo de using_simpy: durações normais e intervalos exponenciais."""
+
+    kind = 'continuous'
+    streams = ('duration', 'interarrival')
+    cursors = ('next_duration', 'next_interarrival')
+
+    def __init__(self, arrival_rate: float, mean_duration: float, std_duration: float,
+                 seed=None, block: int = WORKLOAD_BLOCK, record: bool = False) -> None:
+        self.arrival_rate = arrival_rate
+        self.mean_duration = mean_duration
+        self.std_duration = std_duration
+        super().__init__(seed, block, record)
+        self.open_streams()
+
+    def open_streams(self, consumed: Optional[Dict[str, int]] = None) -> None:
+        consumed = consumed or {}
+        self.next_duration = self.stream('duration', consumed.get('duration', 0)).__next__
+        self.next_interarrival = self.stream('interarrival', consumed.get('interarrival', 0)).__next__
+
+    def sample(self, name: str, size: int) -> np.ndarray:
+        rng = self.rngs[name]
+        if name == 'duration':
+            return np.maximum(0, rng.normal(self.mean_duration, self.std_duration, size=size))
+        # Intervalo médio de arrival_rate, como random.expovariate(1 / arrival_rate)
+        return rng.exponential(self.arrival_rate, size=size)
+
+    def params(self) -> dict:
+        return {'arrival_rate': self.arrival_rate, 'mean_duration': self.mean_duration,
+                'std_duration': self.std_duration}
+
+
+WORKLOADS = {cls.kind: cls for cls in (TickWorkload, ContinuousWorkload)}
+
+
+def load_workload(path: str) -> Workload:
+    # Workload que reproduz, sem sortear, os valores gravados por save()
+    with np.load(path) as data:
+        params = json.loads(str(data['params']))
+        cls = WORKLOADS[params.pop('kind')]
+        workload = cls(**params)
+        workload.replay = {name: data[name] for name in cls.streams}
+    return workload